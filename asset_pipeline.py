@@ -0,0 +1,120 @@
+# --------------------------------------------------------------- GGG GOLF IMAGE ASSET PIPELINE ---------------------------------------------------------------
+# Build-once image pipeline for banners and the prize gallery.
+# Source photos are rotated and resized into responsive variants ONE time, then cached on disk
+# keyed by the source file's content hash. Byte-identical files (e.g. GGGOLF-2.jpg / GGGOLF-2.png)
+# share a single set of variants. Run `python asset_pipeline.py` to pre-build everything before deploy.
+import hashlib
+import logging
+import os
+import sys
+import threading
+from PIL import Image, ImageOps
+
+log = logging.getLogger(__name__)
+
+ASSET_CACHE_DIR = ".asset_cache"
+ASSET_QUALITY = 82
+
+# Variant name -> max width in pixels (images are only ever shrunk, never upscaled)
+ASSET_VARIANTS = {"thumbnail": 320, "mobile": 720, "desktop": 1280}
+
+# Photos that need a fixed rotation before display (PIL degrees, positive = counter-clockwise)
+ASSET_ROTATIONS = {
+    "GGGopenBanner2.jpg": -90,
+    "radgolfgps.jpg": 90,
+    "ForezoBallMarkers.jpg": -90,
+    "newscorecard.jpg": 90,
+}
+
+# Every image the app shows, so the whole set can be built up front
+APP_IMAGES = [
+    "GGGOLF-2.png", "2026_Players.jpeg", "newscorecard.jpg",
+    "GGGopenBanner2.jpg", "rockstarBag1.jpg", "taylormadeBag.jpg", "PackerJacket.jpg", "takeya.jpg",
+    "radgolfgps.jpg", "70wedge.jpg", "ForezoBallMarkers.jpg", "20260602_115446.jpg", "20260603_213525.jpg",
+    "Sandals.jpg",
+]
+
+_digest_memo = {}
+
+
+def file_digest(path):
+    # Content hash of the source file, memoized on (path, mtime, size) so reruns never re-read megabytes
+    stat = os.stat(path)
+    memo_key = (path, stat.st_mtime_ns, stat.st_size)
+    if memo_key not in _digest_memo:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        _digest_memo[memo_key] = h.hexdigest()
+    return _digest_memo[memo_key]
+
+
+def _render_variants(src_path, rotation, outputs):
+    # outputs: variant -> cache path without extension (.jpg, or .png when the image has transparency)
+    with Image.open(src_path) as img:
+        if rotation:
+            # Hand-tuned rotations work on the raw pixels, same as the old Image.rotate() calls
+            img = img.rotate(rotation, expand=True)
+        else:
+            # Re-encoding drops EXIF, so bake in the orientation the browser used to apply
+            img = ImageOps.exif_transpose(img)
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        img = img.convert("RGBA" if has_alpha else "RGB")
+
+        for variant, out_base in outputs.items():
+            max_w = ASSET_VARIANTS[variant]
+            out = img
+            if out.width > max_w:
+                out = out.resize((max_w, round(out.height * max_w / out.width)), Image.LANCZOS)
+            out_path = out_base + (".png" if has_alpha else ".jpg")
+            # Unique temp name so the background warm-up and a page request can't clobber each other
+            tmp_path = f"{out_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            if has_alpha:
+                out.save(tmp_path, format="PNG", optimize=True)
+            else:
+                out.save(tmp_path, format="JPEG", quality=ASSET_QUALITY, optimize=True, progressive=True)
+            os.replace(tmp_path, out_path)
+
+
+def _cached_variants(stem):
+    found = {}
+    for variant in ASSET_VARIANTS:
+        for ext in (".jpg", ".png"):
+            path = os.path.join(ASSET_CACHE_DIR, f"{stem}_{variant}{ext}")
+            if os.path.exists(path):
+                found[variant] = path
+    return found
+
+
+def asset_path(name, variant="mobile"):
+    # Path to the cached variant of an app image, building it on first use. None if the source is missing.
+    if not os.path.exists(name):
+        return None
+    rotation = ASSET_ROTATIONS.get(name, 0)
+    stem = f"{file_digest(name)[:20]}_r{rotation}"
+
+    found = _cached_variants(stem)
+    if variant not in found:
+        os.makedirs(ASSET_CACHE_DIR, exist_ok=True)
+        missing = {v: os.path.join(ASSET_CACHE_DIR, f"{stem}_{v}") for v in ASSET_VARIANTS if v not in found}
+        _render_variants(name, rotation, missing)
+        found = _cached_variants(stem)
+    return found.get(variant)
+
+
+def build_all(names=None):
+    built = {}
+    for name in names or APP_IMAGES:
+        if asset_path(name, "desktop") is None:
+            log.warning("Missing source image: %s", name)
+            continue
+        built[name] = {v: asset_path(name, v) for v in ASSET_VARIANTS}
+    return built
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    for name, variants in build_all(sys.argv[1:] or None).items():
+        sizes = ", ".join(f"{v} {os.path.getsize(p) // 1024} KB" for v, p in variants.items())
+        print(f"{name}: {sizes}")
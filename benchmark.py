@@ -0,0 +1,219 @@
+# --------------------------------------------------------------- GGG GOLF BENCHMARKS ---------------------------------------------------------------
+# Times the app's hot paths against synthetic leagues (30 / 300 / 3,000 players by default) so we can see
+# where things break as the league grows. Results are written as JSON for tracking regressions:
+#   python benchmark.py                          -> all scales, JSON on stdout
+#   python benchmark.py --sizes 30 300 -o bench.json
+import argparse
+import datetime
+import json
+import platform
+import random
+import secrets
+import statistics
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from league_engine import (
+    HANDICAP_TARGET_WEEKS, LEAGUE_START, LIVE_HOLES, build_live_scorecard, calculate_rolling_handicap,
+    clean_scores, get_score_window_status, handicap_audit, handicap_matrix, hash_pins, history_index, history_page,
+    history_positions, lookup_handicap, optimize_pairings, pairing_history, patch_live_scorecard, pin_index,
+    player_dashboards, season_standings, weekly_points,
+)
+from league_data import LIVE_CONFLICT, LIVE_TABLE, SCORES_TABLE, LeagueRepository, SQLiteBackend
+
+BENCH_SIZES = [30, 300, 3000]
+BENCH_REPEAT = 5
+PRE_SEASON_WEEKS = [-2, -1]
+# Week 12 is only ever stored as its 12-A / 12-B halves
+SEASON_WEEKS = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 121, 122, 13, 14]
+HOLE_PARS = [4, 4, 3, 5, 4, 4, 3, 4, 5, 4, 3, 4, 5, 4, 4, 3, 5, 4]
+
+
+# --- SYNTHETIC LEAGUE ---
+
+def synthetic_league(players, seed=0):
+    # Registration row + pre-season + full season (incl. 12-A / 12-B) per player, shaped like league_scores_2026
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(players):
+        name = f"Player {i:04d}"
+        skill = rnd.uniform(38, 58)
+        rows.append({
+            "Week": 0, "Player": name, "PIN": f"{rnd.randint(0, 9999):04d}", "Pars_Count": 0, "Birdies_Count": 0,
+            "Eagle_Count": 0, "Total_Score": 0, "Handicap": 0.0, "Net_Score": 0.0, "DNF": True, "Acknowledged": True,
+        })
+        for week in PRE_SEASON_WEEKS + SEASON_WEEKS:
+            if rnd.random() < 0.15:
+                continue  # Missed week
+            dnf = rnd.random() < 0.05
+            gross = 0 if dnf else int(round(rnd.gauss(skill, 3)))
+            rows.append({
+                "Week": week, "Player": name, "PIN": None, "Pars_Count": rnd.randint(0, 8),
+                "Birdies_Count": rnd.randint(0, 2), "Eagle_Count": int(rnd.random() < 0.02), "Total_Score": gross,
+                "Handicap": 0.0, "Net_Score": 0.0 if dnf else float(gross), "DNF": dnf, "Acknowledged": False,
+            })
+    return rows
+
+
+def synthetic_live_round(players, week=1, seed=0):
+    # Every player through all 18 holes, as live_scores rows
+    rnd = random.Random(seed)
+    return [
+        {"week": week, "player_name": f"Player {i:04d}", "hole_number": hole,
+         "score": max(1, HOLE_PARS[hole - 1] + rnd.choice([-1, 0, 0, 0, 1, 1, 2]))}
+        for i in range(players) for hole in LIVE_HOLES
+    ]
+
+
+# --- TIMING ---
+
+def _time(fn, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - start) * 1000)
+    return runs
+
+
+def _result(scale, case, runs, rows):
+    return {
+        "scale": scale, "case": case, "rows": rows, "runs": len(runs),
+        "best_ms": round(min(runs), 3), "median_ms": round(statistics.median(runs), 3),
+    }
+
+
+def bench_scale(players, repeat=BENCH_REPEAT, seed=0):
+    results = []
+    score_rows = synthetic_league(players, seed)
+    live_rows = synthetic_live_round(players, seed=seed)
+
+    # Same backend the app can run on (GGG_SQLITE_PATH), in memory
+    backend = SQLiteBackend(":memory:")
+    backend.insert(SCORES_TABLE, score_rows)
+    backend.upsert(LIVE_TABLE, live_rows, on_conflict=LIVE_CONFLICT)
+    repo = LeagueRepository(backend)
+
+    def record(case, fn, rows, runs=repeat):
+        results.append(_result(players, case, _time(fn, runs), rows))
+
+    # load_data: fetch, then parse into the compact frame
+    record("load_fetch_sqlite", lambda: repo.scores(), len(score_rows))
+    fetched = repo.scores()
+    pin_key = secrets.token_bytes(32)
+
+    def load_parse():
+        # load_data's path after the fetch: hash PINs, clean + compact, index PINs, drop them from the frame
+        clean = clean_scores(hash_pins(pd.DataFrame(fetched), pin_key), list(score_rows[0]))
+        pin_index(clean)
+        return clean.drop(columns=['PIN'], errors='ignore')
+
+    record("load_parse", load_parse, len(score_rows))
+    df = load_parse()
+
+    # Handicaps: the season matrix the app uses, and the roster looped through the deprecated single-player
+    # entry point (a matrix per call) vs. cell lookups on the season matrix
+    record("handicap_matrix", lambda: handicap_matrix(df), len(df))
+    matrix = handicap_matrix(df)
+    record("handicap_audit", lambda: handicap_audit(df, matrix=matrix), len(df), runs=max(1, repeat // 5) if players >= 1000 else repeat)
+    # Season Dashboard: every player's metrics + chart series in one pass
+    record("player_dashboards", lambda: player_dashboards(df), len(df))
+    roster = df['Player'].cat.categories.tolist()
+    by_player = {p: g for p, g in df.groupby('Player', observed=True)}
+
+    def rolling_handicap_roster():
+        # Timed on purpose, so its DeprecationWarning is not the point here
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            return [calculate_rolling_handicap(by_player[p], 13) for p in roster]
+
+    record(
+        "calculate_rolling_handicap_roster", rolling_handicap_roster,
+        len(df), runs=max(1, repeat // 5) if players >= 1000 else repeat,
+    )
+    record("lookup_handicap_roster", lambda: [lookup_handicap(matrix, p, 13) for p in roster], len(df))
+
+    # Standings / History
+    record("weekly_points", lambda: weekly_points(df), len(df))
+    points = weekly_points(df)
+    record("season_standings", lambda: season_standings(points), len(points))
+    record("history_index", lambda: history_index(points), len(points))
+    index = history_index(points)
+    one_player = roster[len(roster) // 2]
+    record(
+        "history_filtered_page",
+        lambda: history_page(index, history_positions(index, player=one_player, week=5)),
+        len(points),
+    )
+
+    # Pairings: one week of foursomes against three published weeks, balancing handicaps
+    history_rows = []
+    for week in (1, 2, 3):
+        groups, _ = optimize_pairings(roster, seed=seed + week)
+        history_rows += [{"week": week, "group_id": g, "players": ", ".join(grp)} for g, grp in enumerate(groups, 1)]
+    history = pairing_history(pd.DataFrame(history_rows), roster)
+    week_hcps = handicap_matrix(df)[5].to_dict()
+    record(
+        "pairing_optimizer",
+        lambda: optimize_pairings(roster, history, week_hcps, seed=seed),
+        players, runs=max(1, repeat // 5) if players >= 1000 else repeat,
+    )
+
+    # Live leaderboard: full pivot, and patching in one hole per player
+    live_df = pd.DataFrame(repo.live_scores(1))
+    record("live_scorecard_pivot", lambda: build_live_scorecard(live_df), len(live_df))
+    card = build_live_scorecard(live_df)
+    delta = live_df[live_df["hole_number"] == 18].assign(score=lambda d: d["score"] + 1)
+    record("live_scorecard_patch", lambda: patch_live_scorecard(card, delta), len(delta))
+
+    # Score window: every player's scorecard render checks its week
+    now = LEAGUE_START + datetime.timedelta(weeks=6, hours=15)
+    record(
+        "score_window_status",
+        lambda: [get_score_window_status(7, now) for _ in range(players)],
+        players,
+    )
+    record(
+        "score_window_status_all_weeks",
+        lambda: [get_score_window_status(w, now) for w in HANDICAP_TARGET_WEEKS],
+        len(HANDICAP_TARGET_WEEKS),
+    )
+    return results
+
+
+def run(sizes=None, repeat=BENCH_REPEAT, seed=0):
+    results = []
+    for players in sizes or BENCH_SIZES:
+        print(f"⏱️ {players} players...", file=sys.stderr)
+        results.extend(bench_scale(players, repeat, seed))
+    return {
+        "generated_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "repeat": repeat,
+        "seed": seed,
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark GGG league hot paths on synthetic leagues.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=BENCH_SIZES, help="League sizes (players)")
+    parser.add_argument("--repeat", type=int, default=BENCH_REPEAT, help="Timed runs per case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.repeat, args.seed)
+    for r in report["results"]:
+        print(f"{r['scale']:>6} {r['case']:<34} {r['median_ms']:>10.2f} ms  ({r['rows']} rows)", file=sys.stderr)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
@@ -1,12 +1,35 @@
 # --------------------------------------------------------------- DEV ENVIRONMENT FOR GGG GOLF ---------------------------------------------------------------
 import streamlit as st
 import pandas as pd
+import os
 import time
-import datetime
 import random
+import threading
+import concurrent.futures
+import functools
+import hmac
+import logging
+import secrets
 import altair as alt
-from PIL import Image
-from zoneinfo import ZoneInfo #<---Add for time zone######################
+from league_engine import (
+    clean_scores, hash_pins, pin_digest, pin_index, handicap_matrix, handicap_audit, update_handicap_matrix, affected_target_weeks,
+    lookup_handicap, format_handicap, weekly_points, season_standings, player_dashboards, DASHBOARD_EMPTY,
+    history_index, history_positions, history_page, HISTORY_PAGE_SIZE, week_label, week_labels,
+    build_live_scorecard, patch_live_scorecard, live_podium, get_score_window_status, current_week,
+    HANDICAP_TARGET_WEEKS, SEASON_CALENDAR, DOUBLE_POINTS, pairing_history, optimize_pairings
+)
+from asset_pipeline import asset_path, build_all
+from league_data import (
+    LeagueRepository, SupabaseBackend, SQLiteBackend, CircuitOpenError, is_undefined_column, is_missing_table,
+    SCORES_TABLE, CHALLENGE_TABLE, EXPENSES_TABLE, BETS_TABLE, PAIRINGS_TABLE, HANDICAPS_TABLE
+)
+from league_profiler import RerunProfiler
+from league_import import (
+    IMPORT_KINDS, read_import_csv, import_template, import_batches, parse_import_week,
+    validate_rounds, validate_registrations, validate_pairings
+)
+
+log = logging.getLogger(__name__)
 
 # --- 1. CONFIGURATION & SESSION STATE ---
 st.set_page_config(page_title="DEV ENVIRONMENT 2026 GGGolf Summer League", layout="wide")
@@ -20,133 +43,321 @@ if "unlocked_player" not in st.session_state: st.session_state["unlocked_player"
 if "authenticated" not in st.session_state: st.session_state["authenticated"] = False
 if "login_timestamp" not in st.session_state: st.session_state["login_timestamp"] = 0
 if "reg_access" not in st.session_state: st.session_state["reg_access"] = False
+if "flash_messages" not in st.session_state: st.session_state["flash_messages"] = []
 
-from st_supabase_connection import SupabaseConnection
-conn = st.connection("supabase", type=SupabaseConnection)
-
-MASTER_COLUMNS = [
-    'Week', 'Player', 'PIN', 'Pars_Count', 'Birdies_Count', 
-    'Eagle_Count', 'Total_Score', 'Handicap', 'Net_Score', 'DNF', 'Acknowledged'
-]
-
-GGG_POINTS = {
-    1: 100, 2: 77, 3: 64, 4: 54, 5: 47, 6: 41, 7: 36, 8: 31, 9: 27, 10: 24,
-    11: 21, 12: 16, 13: 13, 14: 9, 15: 8, 16: 7, 17: 6, 18: 5, 19: 4, 20: 3,
-    21: 2, 22: 2, 23: 1, 24: 1, 25: 1, 26: 1, 27: 1, 28: 1, 29: 1, 30: 1, 
-    31: 1, 32: 1
-}
+def flash(message, icon="✅"):
+    # Carry a notice across st.rerun() instead of sleeping so the user can read it first
+    st.session_state["flash_messages"].append((message, icon))
 
-# --- 2. CORE FUNCTIONS ---
+def show_flash_messages():
+    while st.session_state["flash_messages"]:
+        message, icon = st.session_state["flash_messages"].pop(0)
+        st.toast(message, icon=icon)
 
-def load_data():
-    try:
-        # Correct Supabase syntax to read all data from the table
-        response = conn.table("league_scores_2026").select("*").execute()
-        
-        # Convert the Supabase response to a Pandas DataFrame
-        data = pd.DataFrame(response.data)
-        
-        if data.empty or 'Player' not in data.columns: 
-            return pd.DataFrame(columns=MASTER_COLUMNS)
-        
-        df = data.dropna(how='all')
-        # Filter out specific players
-        df = df[df['Player'].str.lower() != 'john']
-        
-        return df[df['Player'] != ""]
-        
-    except Exception as e:
-        st.warning(f"Database error: {e}")
-        return pd.DataFrame(columns=MASTER_COLUMNS)
+show_flash_messages()
 
-def calculate_rolling_handicap(player_df, target_week):
-    try:
-        # Map internal weeks 121 and 122 chronologically for sorting
-        week_order = {-2: -2, -1: -1, 0: 0, 1: 1, 2: 2, 3: 3, 4: 4, 5: 5, 6: 6, 7: 7, 8: 8, 9: 9, 10: 10, 11: 11, 121: 12.1, 122: 12.2, 13: 13, 14: 14}
-        effective_target = week_order.get(target_week, target_week)
+@st.cache_resource
+def get_repository():
+    # Set GGG_SQLITE_PATH to run the app against a local SQLite file (":memory:" for a throwaway league)
+    sqlite_path = os.environ.get("GGG_SQLITE_PATH")
+    if sqlite_path:
+        return LeagueRepository(SQLiteBackend(sqlite_path))
+    from st_supabase_connection import SupabaseConnection
+    return LeagueRepository(SupabaseBackend(st.connection("supabase", type=SupabaseConnection)))
 
-        if target_week in [4, 8]:
-            return 0.0
+repo = get_repository()
 
-        if 'Total_Score' in player_df.columns:
-            player_df = player_df.copy()
-            player_df['Total_Score'] = pd.to_numeric(player_df['Total_Score'], errors='coerce')
-            player_df['Effective_Week'] = player_df['Week'].map(lambda w: week_order.get(w, w))
+@st.cache_resource
+def get_profiler():
+    # Off until an admin turns it on; then every session's reruns are timed
+    return RerunProfiler()
 
-        excluded_weeks = [4, 8]
-        
-        eligible_rounds = player_df[
-            (~player_df['Week'].isin(excluded_weeks)) &
-            (player_df['DNF'] == False) &
-            (player_df['Effective_Week'] < effective_target) &
-            (player_df['Total_Score'].notna()) &
-            (player_df['Total_Score'] > 0)
-        ].sort_values('Effective_Week', ascending=False)
+def set_profiling(enabled):
+    profiler.enabled = enabled
+    repo.on_query = profiler.record_query if enabled else None
 
-        if len(eligible_rounds) < 3:
-            return 0.0
+profiler = get_profiler()
+profiler.begin(st.session_state.get("main_tabs") or "App load")
 
-        last_scores = eligible_rounds.head(4)['Total_Score'].tolist()
-        last_scores.sort() 
-        hcp = round((sum(last_scores[:3]) / 3) - 36, 1)
+MASTER_COLUMNS = [
+    'Week', 'Player', 'PIN', 'Pars_Count', 'Birdies_Count', 
+    'Eagle_Count', 'Total_Score', 'Handicap', 'Net_Score', 'DNF', 'Acknowledged'
+]
 
-        return float(min(hcp, 16.0))
+# --- 2. CORE FUNCTIONS ---
 
-    except Exception:
-        return 0.0
+# Cache registry: one version counter per table. Cached results declare the tables they are built from
+# (cached_on) and are keyed by those tables' versions, so a write only invalidates what read that table.
+# The versions come from the frame being passed in (load_data stamps df.attrs["versions"]), never the live
+# counter, so a session still holding an older frame can't file its results under a newer version.
+@st.cache_resource
+def _cache_registry():
+    return {"lock": threading.Lock(), "versions": {}}
+
+def table_versions(*tables):
+    versions = _cache_registry()["versions"]
+    return tuple(versions.get(t, 0) for t in tables)
+
+def bump_tables(*tables):
+    reg = _cache_registry()
+    with reg["lock"]:
+        for t in tables:
+            reg["versions"][t] = reg["versions"].get(t, 0) + 1
+
+def frame_versions(df, *tables):
+    # Versions the frame was loaded at; unstamped frames (the empty fallback) key as None
+    stamped = df.attrs.get("versions", {})
+    return tuple(stamped.get(t) for t in tables)
+
+def cached_on(*tables, max_entries=8, shared=False):
+    # st.cache_data keyed by the leading _df's table versions (the frame itself is not hashed). shared=True uses
+    # st.cache_resource instead: one object handed to every session without pickling, so treat it as read-only.
+    def decorate(fn):
+        cache = st.cache_resource if shared else st.cache_data
+        cached = cache(max_entries=max_entries, show_spinner=False)(fn)
+        @functools.wraps(fn)
+        def wrapper(*args):
+            return cached(*args, frame_versions(args[0], *tables))
+        return wrapper
+    return decorate
+
+def invalidate_tables(*tables):
+    # After a write: expire only the touched tables. Scores are versioned by load_data once the synced rows
+    # actually change; the secondary tables are bumped here so their snapshots refetch on the next read.
+    if SCORES_TABLE in tables:
+        expire_scores_snapshot()
+    bump_tables(*[t for t in tables if t in SECONDARY_TABLES])
+
+SCORES_SYNC_TTL = 30          # Seconds every session reuses the shared snapshot before asking for changes
+SCORES_FULL_RESYNC = 15 * 60  # Periodic full reload so deleted rows also drop out of the snapshot
+# Only the columns the views use (not select *). updated_at drives the incremental sync (supabase_migrations.sql);
+# "League Fee Paid" is optional (quoted because of the space) and is dropped from the projection if the table lacks it
+SCORES_CORE_COLUMNS = ",".join(MASTER_COLUMNS + ['updated_at'])
+SCORES_COLUMNS = SCORES_CORE_COLUMNS + ',"League Fee Paid"'
+
+@st.cache_resource
+def _scores_snapshot():
+    # One snapshot per server process, shared by every phone/session
+    return {"lock": threading.Lock(), "raw": None, "df": None, "columns": SCORES_COLUMNS,
+            "cursor": None, "synced_at": 0.0, "full_synced_at": 0.0,
+            "pins": {}, "pin_key": secrets.token_bytes(32), "handicaps": None}
+
+def verify_pin(player, pin):
+    # None if the player has no registration row, otherwise whether the PIN matches
+    snap = _scores_snapshot()
+    stored = snap["pins"].get(player)
+    if stored is None:
+        return None
+    return hmac.compare_digest(stored, pin_digest(snap["pin_key"], pin))
+
+def _merge_score_rows(cached, delta):
+    # Changed rows replace their cached copy (by id, or by Week + Player if the table has no id)
+    key = ['id'] if 'id' in delta.columns and 'id' in cached.columns else ['Week', 'Player']
+    merged = pd.concat([cached, delta], ignore_index=True)
+    return merged.drop_duplicates(subset=key, keep='last').reset_index(drop=True)
+
+def _select_scores(snap, changed_since=None):
+    # Projected read. Only a missing column steps the projection down (optional columns first, then select *)
+    # for the rest of the process; timeouts, 5xx and an open breaker are raised to load_data as usual.
+    while True:
+        try:
+            return repo.scores(changed_since=changed_since, columns=snap["columns"])
+        except Exception as e:
+            if snap["columns"] == "*" or not is_undefined_column(e):
+                raise
+            snap["columns"] = SCORES_CORE_COLUMNS if snap["columns"] == SCORES_COLUMNS else "*"
 
-def get_score_window_status(week_num):
-    if week_num <= 0:
-        return True, ""
-        
-    tz = ZoneInfo('America/Chicago')
-    now = datetime.datetime.now(tz)
-    
-    league_start = datetime.datetime(2026, 5, 31, tzinfo=tz)
-    
-    # Map 121 and 122 back to Week 12 for the actual timeline date
-    real_week = 12 if week_num in [121, 122] else week_num
-    play_date = league_start + datetime.timedelta(weeks=real_week - 1)
-    
-    window_start = play_date.replace(hour=14, minute=0, second=0, microsecond=0)
-    window_end = play_date + datetime.timedelta(days=1)
-    window_end = window_end.replace(hour=12, minute=0, second=0, microsecond=0)
-    
-    display_week = "12-A" if week_num == 121 else "12-B" if week_num == 122 else str(week_num)
+def load_data():
+    snap = _scores_snapshot()
+    with snap["lock"]:
+        now = time.time()
+        if snap["df"] is not None and now - snap["synced_at"] < SCORES_SYNC_TTL:
+            return snap["df"]
 
-    if now < window_start:
-        return False, f"Score entry for Week {display_week} opens on {window_start.strftime('%A, %b %d at %I:%M %p')}."
-    elif now > window_end:
-        return False, f"Score entry for Week {display_week} closed on {window_end.strftime('%A, %b %d at %I:%M %p')}."
-    else:
-        return True, ""
-        
-    tz = ZoneInfo('America/Chicago')
-    now = datetime.datetime.now(tz)
-    
-    # League start date is May 31, 2026
-    league_start = datetime.datetime(2026, 5, 31, tzinfo=tz)
-    
-    # Calculate the Sunday of the target week
-    play_date = league_start + datetime.timedelta(weeks=week_num - 1)
-    
-    # Window opens Sunday at 2:00 PM CDT
-    window_start = play_date.replace(hour=14, minute=0, second=0, microsecond=0)
-    
-    # Window closes Monday at 12:00 PM CDT
-    window_end = play_date + datetime.timedelta(days=1)
-    window_end = window_end.replace(hour=12, minute=0, second=0, microsecond=0)
-    
-    # Check if current time falls within the window
-    if now < window_start:
-        return False, f"Score entry for Week {week_num} opens on {window_start.strftime('%A, %b %d at %I:%M %p')}."
-    elif now > window_end:
-        return False, f"Score entry for Week {week_num} closed on {window_end.strftime('%A, %b %d at %I:%M %p')}."
+        try:
+            if snap["raw"] is None or snap["cursor"] is None or now - snap["full_synced_at"] > SCORES_FULL_RESYNC:
+                # Full read of the scores table
+                raw = hash_pins(pd.DataFrame(_select_scores(snap)), snap["pin_key"])
+                snap["full_synced_at"] = now
+                changed = True
+                delta = None
+            else:
+                # Only pull rows touched since the last sync (gte so same-timestamp writes are not missed)
+                delta = hash_pins(pd.DataFrame(_select_scores(snap, changed_since=snap["cursor"])), snap["pin_key"])
+                changed = not delta.empty
+                raw = _merge_score_rows(snap["raw"], delta) if changed else snap["raw"]
+        except Exception as e:
+            # Serve the last good snapshot instead of an empty league (the cooling-off banner covers an open breaker)
+            if not isinstance(e, CircuitOpenError):
+                st.warning(f"Database error: {e}")
+            return snap["df"] if snap["df"] is not None else pd.DataFrame(columns=MASTER_COLUMNS)
+
+        snap["raw"] = raw
+        snap["cursor"] = raw['updated_at'].max() if 'updated_at' in raw.columns and raw['updated_at'].notna().any() else None
+        snap["synced_at"] = now
+        if changed or snap["df"] is None:
+            clean = clean_scores(raw, MASTER_COLUMNS)
+            snap["pins"] = pin_index(clean)
+            snap["df"] = clean.drop(columns=['PIN'], errors='ignore')
+            snap["handicaps"] = _refresh_handicaps(snap["handicaps"], snap["df"], delta)
+            bump_tables(SCORES_TABLE)
+            # The frame and its matrix carry the version they were built at (see cached_on / handicaps_for)
+            stamp = {SCORES_TABLE: table_versions(SCORES_TABLE)[0]}
+            snap["df"].attrs["versions"] = stamp
+            snap["handicaps"].attrs["versions"] = dict(stamp)
+        return snap["df"]
+
+def expire_scores_snapshot(full=False):
+    # Called after every write so the next rerun syncs right away instead of waiting out the TTL
+    snap = _scores_snapshot()
+    snap["synced_at"] = 0.0
+    if full:
+        snap["full_synced_at"] = 0.0
+
+def stamp_scores_row(entry):
+    # Bump updated_at on writes when the table tracks it, so incremental syncs pick the row up
+    if _scores_snapshot()["cursor"] is not None:
+        entry["updated_at"] = "now()"
+    return entry
+
+def _seed_handicaps(df):
+    # Cold start: the persisted handicap table, recomputing only players whose latest round was written after
+    # their latest handicap row (or who have no complete row). Recomputed players are written back.
+    try:
+        stored = pd.DataFrame(repo.handicaps())
+    except Exception as e:
+        # No table before the migration is expected; anything else is logged. Either way this start builds from
+        # the scores, and the snapshot keeps that matrix current from here on
+        if not is_missing_table(e):
+            log.warning("Could not read %s, building handicaps from the scores: %s", HANDICAPS_TABLE, e)
+        return handicap_matrix(df)
+    if 'updated_at' not in df.columns or df.empty:
+        return handicap_matrix(df)
+    if stored.empty:
+        # Nothing stored yet (first start after the migration): build it all and store it
+        matrix = handicap_matrix(df)
+        stale_players = matrix.index.tolist()
     else:
-        return True, ""
-# End for time lock #--------------JULY 6 TIME LOCK EDIT START ---------------
-
-def save_weekly_data(week, player, pars, birdies, eagles, score_val, hcp_val, pin):
+        players = sorted(df['Player'].dropna().astype(str).unique().tolist())
+        matrix = stored.pivot_table(index='Player', columns='Week', values='Handicap', aggfunc='last')
+        matrix = matrix.reindex(index=pd.Index(players, name='Player'), columns=HANDICAP_TARGET_WEEKS)
+        matrix.columns.name = None
+        written = pd.to_datetime(stored.groupby('Player')['updated_at'].max(), utc=True, format='ISO8601').reindex(players)
+        played = pd.to_datetime(df.groupby('Player', observed=True)['updated_at'].max(), utc=True, format='ISO8601')
+        played.index = played.index.astype(str)
+        stale = matrix.isna().any(axis=1) | written.isna() | (played.reindex(players) > written)
+        stale_players = matrix.index[stale].tolist()
+        if stale_players:
+            matrix.loc[stale_players] = handicap_matrix(df[df['Player'].isin(stale_players)], players=stale_players).to_numpy()
+    if stale_players:
+        try:
+            for batch in import_batches(handicap_rows(matrix, stale_players)):
+                repo.upsert_handicaps(batch)
+        except Exception as e:
+            # Still stale next cold start, so they are simply recomputed again
+            log.warning("Could not store handicaps for %d player(s): %s", len(stale_players), e)
+    return matrix.astype(float)
+
+def _refresh_handicaps(matrix, df, delta):
+    # Materialized handicaps: seeded from the stored table on a cold start, rebuilt on later full loads,
+    # otherwise only the target weeks the changed rounds can move
+    if matrix is None:
+        with profiler.span("handicap_seed"):
+            return _seed_handicaps(df)
+    if delta is None or delta.empty or 'Player' not in delta.columns:
+        with profiler.span("handicap_matrix"):
+            return handicap_matrix(df)
+    players = set(df['Player'].astype(str))
+    changes = [(p, w) for p, w in zip(delta['Player'], pd.to_numeric(delta['Week'], errors='coerce'))
+               if p in players and pd.notna(w)]
+    with profiler.span(f"handicap_update ({len(changes)} rounds)"):
+        return update_handicap_matrix(matrix, df, changes)[0]
+
+def get_handicap_matrix():
+    # Whole roster x every target week, kept current by load_data; reads are plain lookups
+    matrix = _scores_snapshot()["handicaps"]
+    return matrix if matrix is not None else handicap_matrix(load_data())
+
+def handicaps_for(df):
+    # The live matrix if it was built from this frame's version, otherwise one built from the frame itself
+    matrix = get_handicap_matrix()
+    if df.attrs.get("versions") and matrix.attrs.get("versions") == df.attrs.get("versions"):
+        return matrix
+    return handicap_matrix(df)
+
+def handicap_rows(matrix, players=None, weeks=None):
+    part = matrix.loc[players if players is not None else matrix.index, weeks if weeks is not None else matrix.columns]
+    return [
+        {"Player": str(player), "Week": int(week), "Handicap": float(hcp), "updated_at": "now()"}
+        for (player, week), hcp in part.stack().items()
+    ]
+
+def persist_handicaps(changes):
+    # Write back only the target weeks the changed rounds can move; changes = {player: [weeks]}
+    df = load_data()
+    matrix = get_handicap_matrix()
+    rows = []
+    for player, weeks in changes.items():
+        if player not in matrix.index:
+            continue
+        player_df = df[df['Player'] == player]
+        affected = set()
+        for week in weeks:
+            affected.update(affected_target_weeks(player_df, week, list(matrix.columns)))
+        targets = [t for t in matrix.columns if t in affected]
+        if targets:
+            rows.extend(handicap_rows(matrix, [player], targets))
+    for batch in import_batches(rows):
+        repo.upsert_handicaps(batch)
+
+@cached_on(SCORES_TABLE)
+def get_weekly_points(_df, versions):
+    # Ranks + GGG points for every completed round, shared by Standings and History
+    with profiler.span("weekly_points"):
+        return weekly_points(_df)
+
+@cached_on(SCORES_TABLE)
+def get_standings(_df, versions):
+    return season_standings(get_weekly_points(_df))
+
+@cached_on(SCORES_TABLE)
+def get_history_index(_df, versions):
+    # History rows ranked, labelled and indexed by (Week, Player) once per data version
+    with profiler.span("history_index"):
+        return history_index(get_weekly_points(_df))
+
+@cached_on(SCORES_TABLE, max_entries=2, shared=True)
+def get_player_dashboards(_df, versions):
+    # Season Dashboard metrics + chart series for every player in one grouped pass
+    with profiler.span("player_dashboards"):
+        return player_dashboards(_df)
+
+@cached_on(SCORES_TABLE, max_entries=2, shared=True)
+def get_dashboard_charts(_df, versions):
+    # Chart specs for the current and previous data version, filled per player on first view, so each
+    # version holds at most one spec per registered player however large the roster grows
+    return {}
+
+def get_dashboard_chart(df, player):
+    # Vega-Lite spec; x axis in season order so 12-A / 12-B sit after Week 12
+    charts = get_dashboard_charts(df)
+    if player not in charts:
+        series = pd.DataFrame(get_player_dashboards(df)[player]["series"])
+        x = alt.X('Week:O', sort=series['Week'].tolist())
+        chart = alt.Chart(series).mark_line(color='#2e7d32', strokeWidth=3).encode(
+            x=x,
+            y=alt.Y('Net_Score:Q', scale=alt.Scale(reverse=True, zero=False))
+        ) + alt.Chart(series).mark_point(color='#2e7d32', size=100, filled=True).encode(x=x, y='Net_Score:Q')
+        charts[player] = chart.properties(height=250).to_dict()
+    return charts[player]
+
+@cached_on(SCORES_TABLE)
+def get_handicap_audit(_df, versions):
+    # Per-round provenance for every player x target week, built from the same matrix the app applies
+    with profiler.span("handicap_audit"):
+        return handicap_audit(_df, matrix=handicaps_for(_df))
+
+def save_weekly_data(week, player, pars, birdies, eagles, score_val, hcp_val):
     try:
         is_dnf = (score_val == "DNF")
         final_gross = 0 if is_dnf else int(score_val)
@@ -160,19 +371,24 @@ def save_weekly_data(week, player, pars, birdies, eagles, score_val, hcp_val, pi
             'Total_Score': int(final_gross),
             'Handicap': float(hcp_val),
             'Net_Score': float(final_gross - hcp_val) if not is_dnf else 0.0,
-            'DNF': is_dnf,
-            'PIN': str(pin)
+            'DNF': is_dnf
         }
         
-        conn.table("league_scores_2026").upsert(new_entry).execute()
-        st.cache_data.clear()
+        repo.upsert_score(stamp_scores_row(new_entry))
+        invalidate_tables(SCORES_TABLE)
+
+        try:
+            persist_handicaps({player: [int(week)]})
+        except Exception as e:
+            # The round is saved and the in-app handicaps are already current; only the stored table lags
+            flash(f"Handicap table not updated: {e}", icon="⚠️")
         
-        st.success(f"👍 Score Submitted Successfully for {player}!", icon="✅")
-        time.sleep(1) 
-        st.rerun()
+        flash(f"👍 Score Submitted Successfully for {player}!")
+        return True
             
     except Exception as e:
         st.error(f"❌ An error occurred: {e}")
+        return False
             
 
 def render_live_scoring():
@@ -226,12 +442,10 @@ def render_live_scoring():
                 
                 if submit_unlock:
                     if user_pin:
-                        p_info = df_main[df_main['Player'] == player_select]
-                        reg_row = p_info[p_info['Week'] == 0]
+                        pin_ok = verify_pin(player_select, user_pin)
                         
-                        if not reg_row.empty:
-                            stored_pin = str(reg_row['PIN'].iloc[0]).split('.')[0].strip()
-                            if user_pin.strip() == stored_pin:
+                        if pin_ok is not None:
+                            if pin_ok:
                                 # Save to BOTH temporary session state AND long-term mobile local storage
                                 current_time = time.time()
                                 st.session_state.update({
@@ -246,8 +460,7 @@ def render_live_scoring():
                                     </script>
                                     """
                                 )
-                                st.success(f"Identity Verified! Welcome, {player_select}.")
-                                time.sleep(0.5)
+                                flash(f"Identity Verified! Welcome, {player_select}.")
                                 st.rerun()
                             else:
                                 st.error("❌ Incorrect PIN.")
@@ -258,143 +471,517 @@ def render_live_scoring():
         
         else:
             # --- 3. INPUT SECTION (Only visible when unlocked) ---
-            st.success(f"Scoring active for: **{player_select}**")
-            
-            with st.expander(f"📝 Enter Score for {player_select}", expanded=True):
-                if 'active_hole' not in st.session_state:
-                    st.session_state.active_hole = 1
+            st.success(f"Scoring active for: **{player_select}** (Week {LIVE_WEEK} round)")
 
-                # 1. Hole Selection via Horizontal Radio
-                # This stays contained and doesn't require vertical scrolling
-                st.write("**Select Hole**")
+            offline_mode = st.toggle(
+                "📶 Spotty signal mode (save holes on this phone, sync when connected)",
+                key="live_offline_mode"
+            )
+
+            if offline_mode:
+                render_live_queue(player_select)
+            else:
+                with st.expander(f"📝 Enter Score for {player_select}", expanded=True):
+                    if 'active_hole' not in st.session_state:
+                        st.session_state.active_hole = 1
+
+                    # 1. Hole Selection via Horizontal Radio
+                    # This stays contained and doesn't require vertical scrolling
+                    st.write("**Select Hole**")
                 
-                hole = st.radio(
-                    "Hole Selection",
-                    options=list(range(1, 19)),
-                    index=list(range(1, 19)).index(st.session_state.active_hole),
-                    horizontal=True,
-                    label_visibility="collapsed",
-                    key="live_hole_radio"
-                )
+                    hole = st.radio(
+                        "Hole Selection",
+                        options=list(range(1, 19)),
+                        index=list(range(1, 19)).index(st.session_state.active_hole),
+                        horizontal=True,
+                        label_visibility="collapsed",
+                        key="live_hole_radio"
+                    )
                 
-                # Update session state with the radio selection
-                st.session_state.active_hole = hole
+                    # Update session state with the radio selection
+                    st.session_state.active_hole = hole
 
-                # 2. Score Form with Slider
-                with st.form("live_score_entry_form", clear_on_submit=True):
-                    # Increased max_value to 20
-                    score = st.slider("Score", min_value=1, max_value=20, value=4)
+                    # 2. Score Form with Slider
+                    with st.form("live_score_entry_form", clear_on_submit=True):
+                        # Increased max_value to 20
+                        score = st.slider("Score", min_value=1, max_value=20, value=4)
                     
-                    if st.form_submit_button("Submit Score", type="primary", use_container_width=True):
-                        try:
-                            new_score = {
-                                "week": 1, 
-                                "player_name": player_select,
-                                "hole_number": st.session_state.active_hole,
-                                "score": score,
-                                "updated_at": "now()"
-                            }
-                            conn.table("live_scores").upsert(new_score, on_conflict="week,player_name,hole_number").execute()
+                        if st.form_submit_button("Submit Score", type="primary", use_container_width=True):
+                            try:
+                                new_score = {
+                                    "week": LIVE_WEEK, 
+                                    "player_name": player_select,
+                                    "hole_number": st.session_state.active_hole,
+                                    "score": score,
+                                    "updated_at": "now()"
+                                }
+                                repo.upsert_live_scores(new_score)
+                                invalidate_live_board(LIVE_WEEK)
                             
-                            # Refresh both temporary and persistent 2-hour storage timers
-                            current_time = time.time()
-                            st.session_state["login_timestamp"] = current_time
-                            st.html(
-                                f"""
-                                <script>
-                                    localStorage.setItem("live_timestamp", Math.floor({current_time}));
-                                </script>
-                                """
-                            )
+                                # Refresh both temporary and persistent 2-hour storage timers
+                                current_time = time.time()
+                                st.session_state["login_timestamp"] = current_time
+                                st.html(
+                                    f"""
+                                    <script>
+                                        localStorage.setItem("live_timestamp", Math.floor({current_time}));
+                                    </script>
+                                    """
+                                )
                             
-                            # Refresh the 2-hour timer so they stay logged in
-                            st.session_state["login_timestamp"] = time.time()
+                                # Refresh the 2-hour timer so they stay logged in
+                                st.session_state["login_timestamp"] = time.time()
                             
-                            st.success(f"Hole {st.session_state.active_hole} saved!")
+                                flash(f"Hole {st.session_state.active_hole} saved!", icon="⛳")
                             
-                            # Auto-advance to next hole
-                            if st.session_state.active_hole < 18:
-                                st.session_state.active_hole += 1
+                                # Auto-advance to next hole
+                                if st.session_state.active_hole < 18:
+                                    st.session_state.active_hole += 1
                             
-                            time.sleep(1)
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Save Failed: {e}")
+                                st.rerun()
+                            except Exception as e:
+                                st.error(f"Save Failed: {e}")
 
     # --- 4. PUBLIC VIEW SECTION (Always visible to all) ---
     st.divider()
-    st.subheader("📊 Live Leaderboard & Scorecard")
+    render_live_leaderboard()
+
+
+LIVE_WEEK = current_week()  # Live scoring always writes to this week's round
+LIVE_REFRESH_OPTIONS = {"Off": None, "10 sec": 10, "30 sec": 30, "60 sec": 60}
+LIVE_FULL_RESYNC = 120  # Seconds between full board reloads (catches rows removed by the Admin reset)
+LIVE_CACHE_TTL = 2      # Seconds every session shares one fetched board before anyone asks Supabase again
+
+@st.cache_resource
+def _live_boards():
+    # Process-wide live board cache: one entry per week, shared by every player and spectator
+    return {"lock": threading.Lock(), "entries": {}}
+
+def _live_board_entry(week):
+    boards = _live_boards()
+    with boards["lock"]:
+        if week not in boards["entries"]:
+            boards["entries"][week] = {"lock": threading.Lock(), "scorecard": None, "cursor": None,
+                                       "full_at": 0.0, "fetched_at": 0.0}
+        return boards["entries"][week]
+
+def get_live_board(week):
+    return _read_live_board(_live_board_entry(week), week)
+
+def _read_live_board(entry, week):
+    # Single-flight read: the first caller in a TTL window fetches, everyone else waits on the lock and shares it.
+    # Also the warm-up's pool task, so the entry is resolved by the caller and nothing here touches st.*
+    with entry["lock"]:
+        now = time.time()
+        if entry["scorecard"] is not None and now - entry["fetched_at"] < LIVE_CACHE_TTL:
+            return entry["scorecard"]
+
+        try:
+            if entry["scorecard"] is None or entry["cursor"] is None or now - entry["full_at"] > LIVE_FULL_RESYNC:
+                df_live = pd.DataFrame(repo.live_scores(week))
+                entry["scorecard"] = build_live_scorecard(df_live)
+                entry["cursor"] = df_live["updated_at"].max() if "updated_at" in df_live.columns and not df_live.empty else None
+                entry["full_at"] = now
+            else:
+                # Pull only hole scores changed since the last poll and patch them in
+                delta = pd.DataFrame(repo.live_scores(week, changed_since=entry["cursor"],
+                                                      columns="player_name,hole_number,score,updated_at"))
+                if not delta.empty:
+                    entry["scorecard"] = patch_live_scorecard(entry["scorecard"], delta)
+                    entry["cursor"] = max(entry["cursor"], delta["updated_at"].max())
+        except Exception:
+            # Database unavailable or cooling off: keep showing the last board we had
+            if entry["scorecard"] is None:
+                raise
+            return entry["scorecard"]
+        entry["fetched_at"] = now
+        return entry["scorecard"]
+
+def invalidate_live_board(week, full=False):
+    # Expire just this week's board so the next reader sees the write
+    entry = _live_board_entry(week)
+    entry["fetched_at"] = 0.0
+    if full:
+        entry["full_at"] = 0.0
+
+def _live_board_body():
+    board_week = st.session_state.get("live_board_week", LIVE_WEEK)
+    try:
+        scorecard = get_live_board(board_week)
+    except Exception as e:
+        st.warning("Scorecard is currently unavailable.")
+        return
+
+    if scorecard.empty:
+        st.info("No scores recorded yet.")
+        return
+
+    # --- UPDATED: CLEAN PODIUM (No arrows) ---
+    st.write("### 🏆 Current Top 3")
     
-    if st.button("🔄 Refresh Leaderboard"):
-        st.rerun()
+    # Lowest totals first, ignoring 0 totals
+    leaderboard = live_podium(scorecard)
     
-    try:
-        response = conn.table("live_scores").select("*").eq("week", 1).execute()
-        df_live = pd.DataFrame(response.data)
-        
-        if not df_live.empty:
-            # 1. Pivot the data to create a scorecard
-            scorecard = df_live.pivot(index="player_name", columns="hole_number", values="score")
-            for i in range(1, 19):
-                if i not in scorecard.columns: scorecard[i] = None
-            
-            # Convert values to numbers for calculation
-            scorecard = scorecard.apply(pd.to_numeric, errors='coerce').fillna(0).astype(int)
-            
-            # Calculate Front 9, Back 9, and Total
-            scorecard["Front 9"] = scorecard[range(1, 10)].sum(axis=1)
-            scorecard["Back 9"] = scorecard[range(10, 19)].sum(axis=1)
-            scorecard["Total"] = scorecard["Front 9"] + scorecard["Back 9"]
-            
-            # --- UPDATED: CLEAN PODIUM (No arrows) ---
-            st.write("### 🏆 Current Top 3")
-            
-            # Sort the scorecard by Total score (ascending) and ignore 0 totals
-            leaderboard = scorecard[scorecard["Total"] > 0].sort_values(by="Total", ascending=True)
-            
-            # Display Podium in a 3-column layout
-            podium_cols = st.columns(3)
-            medals = ["🥇 1st", "🥈 2nd", "🥉 3rd"]
-            
-            for rank in range(3):
-                if rank < len(leaderboard):
-                    player = leaderboard.index[rank]
-                    score = leaderboard.iloc[rank]["Total"]
-                    
-                    # By putting the player's name in the label, the arrow is removed completely
-                    podium_cols[rank].metric(
-                        label=f"{medals[rank]} - {player}",
-                        value=f"{score} Strokes"
-                    )
-                else:
-                    podium_cols[rank].metric(label=medals[rank], value="Waiting...")
-                    
-            st.divider()
-            
-            # --- 2. FULL DETAILED SCORECARD ---
-            st.write("### 📋 Full Scorecard")
-            cols_order = list(range(1, 10)) + ["Front 9"] + list(range(10, 19)) + ["Back 9", "Total"]
-            display_df = scorecard[cols_order].replace(0, '-')
-            
-            st.dataframe(display_df, use_container_width=True)
+    # Display Podium in a 3-column layout
+    podium_cols = st.columns(3)
+    medals = ["🥇 1st", "🥈 2nd", "🥉 3rd"]
+    
+    for rank in range(3):
+        if rank < len(leaderboard):
+            player = leaderboard.index[rank]
+            score = leaderboard.iloc[rank]["Total"]
             
+            # By putting the player's name in the label, the arrow is removed completely
+            podium_cols[rank].metric(
+                label=f"{medals[rank]} - {player}",
+                value=f"{score} Strokes"
+            )
         else:
-            st.info("No scores recorded yet.")
-    except Exception as e:
-        st.warning("Scorecard is currently unavailable.")
+            podium_cols[rank].metric(label=medals[rank], value="Waiting...")
+            
+    st.divider()
+    
+    # --- 2. FULL DETAILED SCORECARD ---
+    st.write("### 📋 Full Scorecard")
+    cols_order = list(range(1, 10)) + ["Front 9"] + list(range(10, 19)) + ["Back 9", "Total"]
+    display_df = scorecard[cols_order].replace(0, '-')
+    
+    st.dataframe(display_df, use_container_width=True)
+
+def render_live_leaderboard():
+    st.subheader("📊 Live Leaderboard & Scorecard")
+
+    # Past rounds stay viewable; the current week's round is the default
+    board_week = st.selectbox(
+        "Round",
+        options=list(range(LIVE_WEEK, 0, -1)),
+        format_func=lambda w: f"Week {w}" + (" (Live)" if w == LIVE_WEEK else ""),
+        key="live_board_week"
+    )
+
+    col_btn, col_auto = st.columns(2)
+    if col_btn.button("🔄 Refresh Leaderboard"):
+        invalidate_live_board(board_week)
+    auto_choice = col_auto.segmented_control(
+        "Auto-refresh",
+        options=list(LIVE_REFRESH_OPTIONS),
+        default="30 sec",
+        key="live_auto_refresh"
+    )
+
+    # Only the board re-runs on the timer; the rest of the page stays put
+    st.fragment(_live_board_body, run_every=LIVE_REFRESH_OPTIONS.get(auto_choice))()
         
 
+# --- OFFLINE LIVE SCORE QUEUE ---
+# Hole scores are kept in the phone's localStorage and flushed to live_scores in one batched upsert.
+# The browser retries with exponential backoff until the server acknowledges the batch, so a dead
+# zone on the course never loses a score and entering a hole never waits on the network.
+LIVE_QUEUE_HTML = """
+<div class="ggg-queue">
+    <div class="ggg-status"></div>
+    <div class="ggg-holes"></div>
+    <div class="ggg-entry">
+        <button class="ggg-step" data-step="-1">−</button>
+        <div class="ggg-score"></div>
+        <button class="ggg-step" data-step="1">+</button>
+    </div>
+    <button class="ggg-save"></button>
+</div>
+"""
+
+LIVE_QUEUE_CSS = """
+.ggg-queue { font-family: var(--st-font, sans-serif); color: var(--st-text-color); }
+.ggg-status { font-size: 14px; margin-bottom: 8px; }
+.ggg-holes { display: grid; grid-template-columns: repeat(6, 1fr); gap: 4px; margin-bottom: 10px; }
+.ggg-hole { padding: 6px 0; border-radius: 6px; border: 1px solid var(--st-border-color, #ccc);
+            background: transparent; color: inherit; font-size: 13px; }
+.ggg-hole.active { border: 2px solid var(--st-primary-color); font-weight: 700; }
+.ggg-hole.saved { background: rgba(46, 125, 50, 0.18); }
+.ggg-hole.pending { background: rgba(255, 152, 0, 0.25); }
+.ggg-entry { display: flex; align-items: center; justify-content: center; gap: 16px; margin-bottom: 10px; }
+.ggg-step { width: 52px; height: 52px; font-size: 26px; border-radius: 50%;
+            border: 1px solid var(--st-border-color, #ccc); background: transparent; color: inherit; }
+.ggg-score { font-size: 34px; font-weight: 700; min-width: 48px; text-align: center; }
+.ggg-save { width: 100%; padding: 12px; font-size: 16px; border: none; border-radius: 8px;
+            background: var(--st-primary-color); color: white; }
+"""
+
+LIVE_QUEUE_JS = """
+const REG = (window.__gggLiveQueue = window.__gggLiveQueue || {});
+const BASE_DELAY = 1000;
+const MAX_DELAY = 60000;
+
+function loadQueue(k) {
+    try { return JSON.parse(localStorage.getItem(k) || "[]"); } catch (e) { return []; }
+}
+function saveQueue(k, q) { localStorage.setItem(k, JSON.stringify(q)); }
+
+function render(s) {
+    const root = s.root;
+    if (!root) return;
+    const queue = loadQueue(s.key);
+    const pending = {};
+    queue.forEach((e) => { pending[e.hole] = e.score; });
+
+    const holes = root.querySelector(".ggg-holes");
+    holes.innerHTML = "";
+    for (let h = 1; h <= 18; h++) {
+        const b = document.createElement("button");
+        const shown = pending[h] !== undefined ? pending[h] : s.saved[h];
+        b.className = "ggg-hole" + (h === s.hole ? " active" : "") +
+            (pending[h] !== undefined ? " pending" : (s.saved[h] !== undefined ? " saved" : ""));
+        b.textContent = shown !== undefined ? `${h}: ${shown}` : `${h}`;
+        b.onclick = () => { s.hole = h; render(s); };
+        holes.appendChild(b);
+    }
+    root.querySelector(".ggg-score").textContent = s.score;
+    root.querySelector(".ggg-save").textContent = `Save Hole ${s.hole}`;
+
+    let status;
+    if (!queue.length) status = "✅ All holes synced.";
+    else if (!navigator.onLine) status = `📴 Offline: ${queue.length} hole(s) saved on this phone, will sync when connected.`;
+    else if (s.error) status = `⚠️ Sync failed, retrying in ${Math.round(s.delay / 1000)}s: ${queue.length} hole(s) waiting.`;
+    else status = `⏳ Syncing ${queue.length} hole(s)...`;
+    root.querySelector(".ggg-status").textContent = status;
+}
+
+function flush(s, force) {
+    clearTimeout(s.timer);
+    const queue = loadQueue(s.key);
+    render(s);
+    if (!queue.length) { s.inflight = 0; return; }
+
+    const now = Date.now();
+    if (s.inflight && !force && now - s.sentAt < s.delay) {
+        s.timer = setTimeout(() => flush(s), s.delay - (now - s.sentAt));
+        return;
+    }
+    // Previous batch was never acknowledged: back off before the next attempt
+    if (s.inflight && !force) s.delay = Math.min(s.delay * 2, MAX_DELAY);
+    if (!navigator.onLine) {
+        s.timer = setTimeout(() => flush(s), s.delay);
+        return;
+    }
+    s.inflight = Math.max(...queue.map((e) => e.seq));
+    s.sentAt = now;
+    s.send("flush", { player: s.player, week: s.week, entries: queue, sent_at: now });
+    s.timer = setTimeout(() => flush(s), s.delay + Math.random() * 500);
+}
+
+export default function (component) {
+    const { data, setTriggerValue, parentElement } = component;
+    const key = `ggg_live_queue::${data.week}::${data.player}`;
+    const s = REG[key] || (REG[key] = {
+        key: key, player: data.player, week: data.week, hole: 1, score: 4,
+        delay: BASE_DELAY, timer: null, inflight: 0, sentAt: 0, lastSeq: 0, saved: {}, error: ""
+    });
+    s.root = parentElement;
+    s.send = setTriggerValue;
+    s.saved = data.saved || {};
+    s.error = data.error || "";
+
+    // Drop every queued hole the server has acknowledged
+    const acked = data.acked || 0;
+    saveQueue(key, loadQueue(key).filter((e) => e.seq > acked));
+    if (s.inflight && acked >= s.inflight) { s.inflight = 0; s.delay = BASE_DELAY; }
+
+    parentElement.querySelectorAll(".ggg-step").forEach((b) => {
+        b.onclick = () => { s.score = Math.min(20, Math.max(1, s.score + parseInt(b.dataset.step))); render(s); };
+    });
+    parentElement.querySelector(".ggg-save").onclick = () => {
+        const queue = loadQueue(key).filter((e) => e.hole !== s.hole);
+        s.lastSeq = Math.max(Date.now(), s.lastSeq + 1);
+        queue.push({ seq: s.lastSeq, hole: s.hole, score: s.score });
+        saveQueue(key, queue);
+        if (s.hole < 18) s.hole += 1;
+        flush(s, true);
+    };
+    if (!s.onlineBound) {
+        window.addEventListener("online", () => flush(REG[key], true));
+        window.addEventListener("offline", () => render(REG[key]));
+        s.onlineBound = true;
+    }
+    flush(s, false);
+}
+"""
+
+live_queue_component = st.components.v2.component(
+    "live_score_queue", html=LIVE_QUEUE_HTML, css=LIVE_QUEUE_CSS, js=LIVE_QUEUE_JS
+)
+
+def flush_live_queue(player, week, entries):
+    # One batched upsert for everything the phone had queued; the newest entry per hole wins
+    latest = {}
+    for entry in sorted(entries, key=lambda e: e.get("seq", 0)):
+        hole, score = int(entry.get("hole", 0)), int(entry.get("score", 0))
+        if 1 <= hole <= 18 and 1 <= score <= 20:
+            latest[hole] = score
+    rows = [
+        {"week": week, "player_name": player, "hole_number": hole, "score": score, "updated_at": "now()"}
+        for hole, score in sorted(latest.items())
+    ]
+    if rows:
+        repo.upsert_live_scores(rows)
+        invalidate_live_board(week)
+    return max((int(e.get("seq", 0)) for e in entries), default=0)
+
+def _on_live_queue_flush(queue_key, player, week):
+    state = st.session_state.get(queue_key)
+    payload = state.get("flush") if hasattr(state, "get") else None
+    if not payload or payload.get("player") != player:
+        return
+    acks = st.session_state.setdefault("live_queue_acked", {})
+    try:
+        acks[queue_key] = max(acks.get(queue_key, 0), flush_live_queue(player, week, payload.get("entries") or []))
+        st.session_state["live_queue_error"] = ""
+        # Refresh the 2-hour timer so they stay logged in
+        st.session_state["login_timestamp"] = time.time()
+    except Exception as e:
+        # Not acknowledged: the phone keeps the holes and retries with backoff
+        st.session_state["live_queue_error"] = str(e)
+
+def render_live_queue(player):
+    queue_key = f"live_queue_{player}"
+    saved = {}
+    try:
+        board = get_live_board(LIVE_WEEK)
+        if player in board.index:
+            row = board.loc[player, list(range(1, 19))]
+            saved = {int(h): int(v) for h, v in row.items() if v > 0}
+    except Exception:
+        pass
+
+    st.caption("Tap a hole, set the score, then Save. Holes are kept on this phone and synced automatically.")
+    live_queue_component(
+        key=queue_key,
+        data={
+            "player": player,
+            "week": LIVE_WEEK,
+            "saved": saved,
+            "acked": st.session_state.get("live_queue_acked", {}).get(queue_key, 0),
+            "error": st.session_state.get("live_queue_error", ""),
+        },
+        on_flush_change=functools.partial(_on_live_queue_flush, queue_key, player, LIVE_WEEK),
+    )
+
+# --- SECONDARY TABLES ---
+# Challenge sign-ups, expenses, bets and pairings are small, independent reads. They are fetched together on a
+# shared thread pool into a process-wide snapshot, so a cold page load costs the slowest query, not the sum.
+TABLE_TTL = 60          # Seconds a fetched table is served to every session before the next read refetches it
+PREFETCH_WORKERS = 6
+
+SECONDARY_TABLES = {
+    CHALLENGE_TABLE: repo.challenge_registrations,
+    EXPENSES_TABLE: repo.expenses,
+    BETS_TABLE: repo.bets,
+    PAIRINGS_TABLE: repo.pairings,
+}
+
+@st.cache_resource
+def _prefetch_pool():
+    return concurrent.futures.ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="ggg-prefetch")
+
+@st.cache_resource
+def _table_snapshots():
+    # table -> {"rows", "synced_at", "version"}, plus the in-flight fetch per table so concurrent readers share it
+    return {"lock": threading.Lock(), "tables": {}, "pending": {}}
+
+def _fetch_table(name, snap, registry):
+    # Runs on the prefetch pool, which has no ScriptRunContext: no st.cache_* calls in here, only the repository
+    # and the snapshot / version registry the submitting script thread resolved
+    versions = registry["versions"]
+    version = versions.get(name, 0)
+    rows = SECONDARY_TABLES[name]() or []
+    with snap["lock"]:
+        old = snap["tables"].get(name)
+        if old is not None and old["rows"] != rows:
+            with registry["lock"]:
+                if versions.get(name, 0) == version:
+                    # Changed outside this app: new version for anything derived from it
+                    versions[name] = version = version + 1
+        # A write during the fetch leaves the entry one version behind, so the next read refetches
+        snap["tables"][name] = {"rows": rows, "synced_at": time.time(), "version": version}
+    return rows
+
+def _is_fresh(entry, name):
+    return entry is not None and entry["version"] == table_versions(name)[0] and time.time() - entry["synced_at"] <= TABLE_TTL
+
+def _submit_fetch(name):
+    # Single-flight: reuse the fetch already running for this table
+    snap = _table_snapshots()
+    with snap["lock"]:
+        future = snap["pending"].get(name)
+        if future is None or future.done():
+            future = _prefetch_pool().submit(_fetch_table, name, snap, _cache_registry())
+            snap["pending"][name] = future
+        return future
+
+def prefetch_tables(names=None):
+    # Refetch every stale table concurrently; returns the futures so callers can wait if they need to
+    tables = _table_snapshots()["tables"]
+    stale = [name for name in (names or SECONDARY_TABLES) if not _is_fresh(tables.get(name), name)]
+    return {name: _submit_fetch(name) for name in stale}
+
+def get_table(name):
+    # Rows from the shared snapshot; a stale or missing table waits on its (possibly already running) fetch
+    entry = _table_snapshots()["tables"].get(name)
+    if _is_fresh(entry, name):
+        return entry["rows"]
+    try:
+        with profiler.span(f"fetch {name}"):
+            return _submit_fetch(name).result()
+    except Exception:
+        # Database unavailable or cooling off: stale rows beat an error
+        if entry is None:
+            raise
+        return entry["rows"]
+
+@st.cache_resource
+def _warm_tables():
+    # Process start: secondary tables and this week's live board load in the background, alongside load_data
+    prefetch_tables()
+    _prefetch_pool().submit(_read_live_board, _live_board_entry(LIVE_WEEK), LIVE_WEEK)
+    return True
+
+_warm_tables()
+
 # --- 3. DATA LOAD ---
-df_main = load_data()
+with profiler.span("load_data"):
+    df_main = load_data()
 EXISTING_PLAYERS = sorted(df_main['Player'].unique().tolist()) if not df_main.empty else []
 
+# The repository's circuit breaker is shared by every session; mirror its cooling-off window into this one
+st.session_state["api_cooling_until"] = repo.breaker.cooling_until
+
+@st.cache_resource
+def _warm_image_assets():
+    # Build every resized/rotated image variant once per process, off the request path
+    threading.Thread(target=build_all, daemon=True).start()
+    return True
+
+_warm_image_assets()
+
+def app_image(name, variant="mobile"):
+    with profiler.span(f"image {name} ({variant})"):
+        return asset_path(name, variant)
+
+def screen_variant():
+    # Phones get the 720px variant; the wide desktop layout gets the 1280px one
+    agent = st.context.headers.get("User-Agent", "")
+    return "mobile" if "Mobi" in agent or "Android" in agent else "desktop"
+
 # --- 4. APP UI ---
 st.markdown("<div style='text-align: center;'>", unsafe_allow_html=True)
-st.image("GGGOLF-2.png", width=480)
-st.image("2026_Players.jpeg", width=1920) 
+st.image(app_image("GGGOLF-2.png", "mobile"), width=480)
+st.image(app_image("2026_Players.jpeg", screen_variant()), use_container_width=True)
 st.markdown("<h1>2026 GGGolf League</h1>", unsafe_allow_html=True)
 st.markdown("</div>", unsafe_allow_html=True)
 
+if time.time() < st.session_state["api_cooling_until"]:
+    resume_at = time.strftime('%I:%M:%S %p', time.localtime(st.session_state["api_cooling_until"]))
+    st.warning(f"⏳ The league database is busy. Showing the last saved data until {resume_at}; please try saving again after that.")
+
 # Inject Custom CSS to make tabs compact and responsive on mobile screens
 st.html(
     """
@@ -416,9 +1003,7 @@ st.html(
     """
 )
 
-tabs = st.tabs(["📝 Scorecard", "🏆 Standings", "📅 History", "⛳ Live Scoring", "🏁 GGG Challenge", "ℹ️ League Info", "👤 Registration", "⚙️ Admin"])
-
-with tabs[0]: # Scorecard
+def render_scorecard():
     if not EXISTING_PLAYERS: 
         st.warning("No players registered yet.")
     else:
@@ -443,18 +1028,15 @@ with tabs[0]: # Scorecard
                 
                 if submit_unlock:
                     if user_pin:
-                        p_info = df_main[df_main['Player'] == player_select]
-                        reg_row = p_info[p_info['Week'] == 0]
+                        pin_ok = verify_pin(player_select, user_pin)
                         
-                        if not reg_row.empty:
-                            stored_pin = str(reg_row['PIN'].iloc[0]).split('.')[0].strip()
-                            if user_pin.strip() == stored_pin:
+                        if pin_ok is not None:
+                            if pin_ok:
                                 st.session_state.update({
                                     "unlocked_player": player_select, 
                                     "login_timestamp": time.time()
                                 })
-                                st.success("Identity Verified!")
-                                time.sleep(0.5)
+                                flash("Identity Verified!")
                                 st.rerun()
                             else:
                                 st.error("❌ Incorrect PIN.")
@@ -464,8 +1046,6 @@ with tabs[0]: # Scorecard
                         st.warning("Please enter your PIN.")
         
         else:
-            p_data = df_main[df_main['Player'] == player_select]
-                       
             st.markdown("### 📅 Select Week")
 
             week_categories = {
@@ -493,7 +1073,7 @@ with tabs[0]: # Scorecard
 
             if isinstance(w_s, int) and w_s <= 0:
                 st.caption(f"📍 Currently Entering: **Pre-Season Round {abs(w_s-1)}**")
-            elif db_w_s in [4, 8]:
+            elif not SEASON_CALENDAR.handicap_applied(db_w_s):
                 st.caption(f"📍 Currently Entering: **Week {w_s} (Event Week)**")
             else:
                 st.caption(f"📍 Currently Entering: **Week {w_s}**")
@@ -501,29 +1081,26 @@ with tabs[0]: # Scorecard
             if isinstance(w_s, int) and w_s <= 0:
                 current_hcp = 0.0
                 st.info("🛠️ Pre-Season: Logging rounds to establish your Week 1 handicap.")
-            elif db_w_s in [4, 8]:
+            elif not SEASON_CALENDAR.handicap_applied(db_w_s):
                 current_hcp = 0.0
                 st.info("💡 GGG Event: No handicap applied for this round.")
             else:
-                current_hcp = calculate_rolling_handicap(p_data, db_w_s)
+                current_hcp = lookup_handicap(get_handicap_matrix(), player_select, db_w_s)
             
-            h_disp = f"+{abs(current_hcp)}" if current_hcp < 0 else f"{current_hcp}"
-            played_rounds = p_data[(p_data['Week'] > 0) & (p_data['DNF'] == False)].sort_values('Week')
+            h_disp = format_handicap(current_hcp)
+            # Precomputed for the whole roster once per data version; week taps only read it
+            dash = get_player_dashboards(df_main).get(player_select, {"metrics": DASHBOARD_EMPTY})["metrics"]
             
             st.markdown(f"### 📊 {player_select}'s Season Dashboard")
             m1, m2, m3, m4, m5 = st.columns(5)
             m1.metric("Current HCP", h_disp)
-            m2.metric("Avg Net", f"{played_rounds['Net_Score'].mean():.1f}" if not played_rounds.empty else "N/A")
-            m3.metric("Total Pars", int(played_rounds['Pars_Count'].sum()))
-            m4.metric("Total Birdies", int(played_rounds['Birdies_Count'].sum()))
-            m5.metric("Total Eagles", int(played_rounds['Eagle_Count'].sum()))
-
-            if not played_rounds.empty:
-                chart = alt.Chart(played_rounds).mark_line(color='#2e7d32', strokeWidth=3).encode(
-                    x=alt.X('Week:O'),
-                    y=alt.Y('Net_Score:Q', scale=alt.Scale(reverse=True, zero=False))
-                ) + alt.Chart(played_rounds).mark_point(color='#2e7d32', size=100, filled=True).encode(x='Week:O', y='Net_Score:Q')
-                st.altair_chart(chart.properties(height=250), use_container_width=True)
+            m2.metric("Avg Net", f"{dash['Avg_Net']:.1f}" if dash['Rounds'] else "N/A")
+            m3.metric("Total Pars", dash['Pars'])
+            m4.metric("Total Birdies", dash['Birdies'])
+            m5.metric("Total Eagles", dash['Eagles'])
+
+            if dash['Rounds']:
+                st.vega_lite_chart(get_dashboard_chart(df_main, player_select), use_container_width=True)
 
             st.divider()
 
@@ -541,76 +1118,45 @@ with tabs[0]: # Scorecard
                     e_c = c3.number_input("Eagles", 0, 18, key=f"e_{player_select}_{db_w_s}")
                     
                     if st.form_submit_button("Confirm & Submit Score", use_container_width=True, type="primary"):
-                        reg_row = p_data[p_data['Week'] == 0]
-                        pin = str(reg_row['PIN'].iloc[0]).split('.')[0].strip()
                         # Use db_w_s to save 121 or 122 instead of the string format
-                        save_weekly_data(db_w_s, player_select, p_c, b_c, e_c, s_v, h_r, pin)
-                        
-                        st.success("Score Saved!")
-                        time.sleep(1)
-                        st.rerun()
+                        if save_weekly_data(db_w_s, player_select, p_c, b_c, e_c, s_v, h_r):
+                            st.rerun()
             else:
                 st.error("🔒 **Score Entry Locked**")
                 st.info(lock_msg) #--------------JULY 6 TIME LOCK EDIT END ---------------
 
-with tabs[1]: # Standings
+def render_standings():
     st.subheader("🏆 Standings")
     if not df_main.empty:
-        v = df_main[(df_main['Week'] > 0) & (df_main['DNF'] == False)].copy()
-        if not v.empty:
-            v['Pts'] = 0.0
-            for w in v['Week'].unique():
-                m = v['Week'] == w
-                v.loc[m, 'R'] = v.loc[m, 'Net_Score'].rank(method='min')
-                for idx, row in v[m].iterrows():
-                    # Uses the 1.0 floor fallback from the previous fix
-                    base_pts = GGG_POINTS.get(int(row['R']), 1.0)
-                    v.at[idx, 'Pts'] = base_pts                    
-            
-            # Aggregate only the total points per player
-            res = v.groupby('Player').agg({'Pts':'sum'}).reset_index().rename(columns={'Pts':'Total Pts'})
-            
+        res = get_standings(df_main)
+        if not res.empty:
             # Display sorted by Total Points from highest to lowest
-            st.dataframe(res.sort_values('Total Pts', ascending=False), use_container_width=True, hide_index=True)
+            st.dataframe(res, use_container_width=True, hide_index=True)
 
 
-with tabs[2]: # History
+def render_history():
     st.subheader("📅 Weekly Scores & GGG Points")
-    h_df = df_main[(df_main['Week'] > 0) & (df_main['DNF'] == False)].copy()
-    if not h_df.empty:
-        h_df['Points'] = 0.0
-        for w in h_df['Week'].unique():
-            mask = h_df['Week'] == w
-            h_df.loc[mask, 'Rank'] = h_df.loc[mask, 'Net_Score'].rank(method='min')
-            for idx, row in h_df[mask].iterrows():
-                base_pts = GGG_POINTS.get(int(row['Rank']), 1.0)
-                h_df.at[idx, 'Points'] = base_pts
-                        
-        f_col1, f_col2 = st.columns(2)
-        all_players = ["All Players"] + sorted(h_df['Player'].unique().tolist())
-        sel_player = f_col1.selectbox("Filter by Player", all_players)
+    history = get_history_index(df_main)
+    if history["weeks"]:
+        f_col1, f_col2, f_col3 = st.columns([2, 2, 1])
+        sel_player = f_col1.selectbox("Filter by Player", ["All Players"] + history["players"])
         
-        # Format the week dropdown dynamically
-        raw_weeks = sorted(h_df['Week'].unique().tolist())
-        all_weeks = ["All Weeks"] + raw_weeks
+        # Chronological, so 12-A / 12-B sit right after Week 12
         sel_week = f_col2.selectbox(
             "Filter by Week", 
-            all_weeks,
-            format_func=lambda x: "12-A" if x == 121 else ("12-B" if x == 122 else (f"Wk {x}" if isinstance(x, int) else x))
+            ["All Weeks"] + history["weeks"],
+            format_func=lambda x: x if x == "All Weeks" else (week_label(x) if x in (121, 122) else f"Wk {x}")
         )
         
-        filtered_df = h_df.copy()
-        if sel_player != "All Players":
-            filtered_df = filtered_df[filtered_df['Player'] == sel_player]
-        if sel_week != "All Weeks":
-            filtered_df = filtered_df[filtered_df['Week'] == sel_week]
-            
-        display_df = filtered_df[['Week', 'Player', 'Total_Score', 'Handicap', 'Net_Score', 'Points']].copy()
-        display_df = display_df.sort_values(['Week', 'Points'], ascending=[False, False])
-        
-        # Translate the Week values for display inside the Dataframe
-        display_df['Week_Label'] = display_df['Week'].map(lambda x: '12-A' if x == 121 else ('12-B' if x == 122 else f"Wk {int(x)}"))
-        display_df = display_df[['Week_Label', 'Player', 'Total_Score', 'Handicap', 'Net_Score', 'Points']]
+        # Filters are lookups on the (Week, Player) index; only the current page goes to the browser
+        positions = history_positions(
+            history,
+            player=None if sel_player == "All Players" else sel_player,
+            week=None if sel_week == "All Weeks" else sel_week
+        )
+        pages = max(1, -(-len(positions) // HISTORY_PAGE_SIZE))
+        page = f_col3.number_input("Page", min_value=1, max_value=pages, value=1, key=f"history_page_{sel_player}_{sel_week}")
+        display_df = history_page(history, positions, page)
 
         st.dataframe(
             display_df, 
@@ -618,17 +1164,18 @@ with tabs[2]: # History
             hide_index=True,
             column_config={
                 "Points": st.column_config.NumberColumn("GGG Points", format="%d pts"),
+                "Handicap": st.column_config.NumberColumn(format="%.1f"),
+                "Net_Score": st.column_config.NumberColumn(format="%.1f"),
                 "Week_Label": "Week"
             }
         )
+        if len(positions):
+            first = (page - 1) * HISTORY_PAGE_SIZE + 1
+            st.caption(f"Showing {first}-{first + len(display_df) - 1} of {len(positions)} rounds (page {page} of {pages})")
     else:
         st.info("No completed rounds recorded yet.")
 
-with tabs[3]:  # Live Scoring
-    # You MUST call the function here to make the content appear
-    render_live_scoring()
-
-with tabs[4]:  # GGG Challenge
+def render_challenge():
     st.header("🏁 GGG Challenge")
     st.write("Seasonal challenges and reward opportunities for GGGolf members.")
     st.divider()
@@ -731,8 +1278,8 @@ with tabs[4]:  # GGG Challenge
         participants_data = []
         try:
             # Fetch all registration records
-            response = conn.table("ChallengeRegistrations").select("*").execute()
-            reg_df = pd.DataFrame(response.data) if response.data else pd.DataFrame(columns=["ChallengeName", "PlayerName", "Paid"])
+            reg_data = get_table(CHALLENGE_TABLE)
+            reg_df = pd.DataFrame(reg_data) if reg_data else pd.DataFrame(columns=["ChallengeName", "PlayerName", "Paid"])
             
             # Filter participants for the selected challenge
             if not reg_df.empty and 'ChallengeName' in reg_df.columns:
@@ -777,9 +1324,9 @@ with tabs[4]:  # GGG Challenge
                 }
                 
                 try:
-                    conn.table("ChallengeRegistrations").insert(new_reg).execute()
-                    st.success(f"Successfully joined {challenge_selection}! Please submit your registration fee to a League Official to update your status.")
-                    time.sleep(1.5)
+                    repo.add_challenge_registration(new_reg)
+                    invalidate_tables(CHALLENGE_TABLE)
+                    flash(f"Successfully joined {challenge_selection}! Please submit your registration fee to a League Official to update your status.")
                     st.rerun()
                 except Exception as e:
                     st.error(f"Registration failed: {e}")
@@ -795,7 +1342,7 @@ with tabs[4]:  # GGG Challenge
             "- Questions about eligibility should be directed to the Rules and Players Committee."
         )
         
-with tabs[5]: # League Info
+def render_league_info():
     st.header("ℹ️ League Information")
     info_category = st.radio("Select a Category:", ["About Us", "Handicaps", "Rules", "Schedule", "Prizes", "Expenses", "Members", "Bets", "Player Pairings"], horizontal=True)
     st.divider()
@@ -843,56 +1390,39 @@ with tabs[5]: # League Info
     elif info_category == "Handicaps":
         st.subheader("📊 League-Wide Handicaps")
         
-        # Determine the latest week played to auto-set the default target week
-        if 'df_main' in globals() and not df_main.empty:
-            played_rounds = df_main[(df_main['Week'] > 0) & (df_main['Total_Score'] > 0)]
-            if not played_rounds.empty:
-                latest_week = int(played_rounds['Week'].max())
-                default_target = latest_week + 1
-            else:
-                default_target = 1
-        else:
-            default_target = 1
-            
-        # Skip GGG Event weeks (4, 8, 12) for the default display
-        if default_target in [4, 8, 12]:
-            default_target += 1
-        # Ensure default doesn't exceed the 14-week season
-        if default_target > 14:
-            default_target = 14
+        # Default to the next non-event week after the latest round played (12-A / 12-B count as Week 12)
+        played_rounds = df_main[(df_main['Week'] > 0) & (df_main['Total_Score'] > 0)]
+        latest_week = int(played_rounds.loc[played_rounds['Week_Key'].idxmax(), 'Week']) if not played_rounds.empty else None
+        default_target = SEASON_CALENDAR.next_week(latest_week, skip_events=True)
 
         # Let user choose the week they want to view handicaps for
+        season_weeks = SEASON_CALENDAR.base_weeks
         target_week = st.selectbox(
             "Select Week to View Applied Handicaps", 
-            options=list(range(1, 15)), 
-            index=list(range(1, 15)).index(default_target) if default_target in range(1, 15) else 0,
+            options=season_weeks, 
+            index=season_weeks.index(default_target),
             help="Select the upcoming week to see everyone's playing handicap."
         )
 
-        if target_week in [4, 8]:
+        if not SEASON_CALENDAR.handicap_applied(target_week):
             st.info(f"💡 Week {target_week} is a GGG Event week. No handicaps are applied.")
         else:
-            if target_week == 12:
+            if SEASON_CALENDAR.week(target_week)["Format"] == DOUBLE_POINTS:
                 st.info("💡 Week 12 is a Double Points Event (18 Holes). The Front 9 (12-A) and Back 9 (12-B) each use your rolling handicap.")
             
-            # Generate the handicap table for all registered players
-            hcp_data = []
+            # Read the handicap table for all registered players straight from the season matrix
             if EXISTING_PLAYERS:
-                for player in EXISTING_PLAYERS:
-                    p_data = df_main[df_main['Player'] == player]
-                    hcp = calculate_rolling_handicap(p_data, target_week)
-                    
-                    # Format for display: Add "+" to positive handicaps for traditional golf styling
-                    hcp_disp = f"+{abs(hcp)}" if hcp < 0 else f"{hcp}"
-                    
-                    hcp_data.append({
-                        "Player": player, 
-                        f"W{target_week} Handicap": hcp_disp,
-                        "_sort_val": hcp # Hidden column just for accurate numeric sorting
-                    })
+                week_hcps = get_handicap_matrix()[target_week].reindex(EXISTING_PLAYERS, fill_value=0.0)
+                
+                # Format for display: Add "+" to positive handicaps for traditional golf styling
+                hcp_df = pd.DataFrame({
+                    "Player": week_hcps.index,
+                    f"W{target_week} Handicap": week_hcps.map(format_handicap).to_numpy(),
+                    "_sort_val": week_hcps.to_numpy() # Hidden column just for accurate numeric sorting
+                })
                 
-                # Create DataFrame, sort by lowest handicap to highest, then drop the hidden sort column
-                hcp_df = pd.DataFrame(hcp_data).sort_values(by=["_sort_val", "Player"]).drop(columns=["_sort_val"])
+                # Sort by lowest handicap to highest, then drop the hidden sort column
+                hcp_df = hcp_df.sort_values(by=["_sort_val", "Player"]).drop(columns=["_sort_val"])
                 
                 st.dataframe(hcp_df, use_container_width=True, hide_index=True)
             else:
@@ -913,101 +1443,67 @@ with tabs[5]: # League Info
         st.subheader("Handicap Calculation Transparency")
         st.write(
             "Use the tool below to inspect how a player's handicap is derived. "
-            "This shows pre-season rounds, the last eligible rounds used, and the exact math (best 3 of last 4 to par 36)."
+            "Every round played before the target week is listed as used, dropped or excluded, with the reason (best 3 of last 4 to par 36)."
         )
 
-        if 'df_main' not in globals() or df_main is None or df_main.empty:
+        if df_main.empty:
             st.warning("No player data available to show handicap breakdown.")
         else:
-            try:
-                reg_players = df_main[df_main['Week'] == 0]['Player'].dropna().unique().tolist()
-                all_players = sorted(df_main['Player'].dropna().unique().tolist())
-                player_options = reg_players if reg_players else all_players
-            except Exception:
-                player_options = sorted(df_main['Player'].dropna().unique().tolist())
+            # Same engine and matrix as the live handicaps, computed once per data version for the whole league
+            audit_rounds, audit_summary = get_handicap_audit(df_main)
+            player_options = EXISTING_PLAYERS or sorted(audit_summary['Player'].unique().tolist())
 
             if not player_options:
                 st.info("No registered players found.")
             else:
                 sel_player = st.selectbox("Select Player to Inspect", player_options, key="handicap_transparency_player")
-                sel_week = st.selectbox("Target Week (handicap to apply for)", list(range(1, 15)), index=0, key="handicap_transparency_week")
+                sel_week = st.selectbox(
+                    "Target Week (handicap to apply for)", HANDICAP_TARGET_WEEKS, index=0,
+                    format_func=lambda x: "12-A" if x == 121 else ("12-B" if x == 122 else f"Week {x}"),
+                    key="handicap_transparency_week"
+                )
 
-                p_df = df_main[df_main['Player'] == sel_player].copy()
-                if p_df.empty:
-                    st.warning("No recorded rounds for this player.")
-                else:
-                    pre_season = p_df[(p_df['Week'] <= 0) & (p_df['DNF'] == False) & (p_df['Total_Score'] > 0)].sort_values('Week', ascending=False)
-                    excluded_weeks = [0, 4, 8]
-                    regular_rounds = p_df[
-                        (p_df['Week'] > 0) &
-                        (~p_df['Week'].isin(excluded_weeks)) &
-                        (p_df['DNF'] == False) &
-                        (p_df['Week'] < sel_week)
-                    ].sort_values('Week', ascending=False)
-
-                    with st.expander("View Rounds Used In Calculation", expanded=True):
-                        st.markdown("**Pre-Season Rounds (Week <= 0)**")
-                        if pre_season.empty:
-                            st.write("No pre-season rounds recorded.")
-                        else:
-                            st.dataframe(pre_season[['Week', 'Total_Score', 'DNF']].reset_index(drop=True), use_container_width=True, hide_index=True)
+                result = audit_summary[(audit_summary['Player'] == sel_player) & (audit_summary['Target_Week'] == sel_week)]
+                p_rounds = audit_rounds[(audit_rounds['Player'] == sel_player) & (audit_rounds['Target_Week'] == sel_week)]
+                used = p_rounds[p_rounds['Status'] == "used"]
 
-                        st.markdown("**Eligible Regular Rounds (excluding Weeks 0, 4, 8)**")
-                        if regular_rounds.empty:
-                            st.write("No eligible regular rounds recorded prior to the selected target week.")
-                        else:
-                            st.dataframe(regular_rounds[['Week', 'Total_Score', 'DNF']].reset_index(drop=True), use_container_width=True, hide_index=True)
-
-                    try:
-                        all_eligible = pd.concat([pre_season, regular_rounds]).drop_duplicates().sort_values('Week', ascending=False)
-                        
-                        if len(all_eligible) < 3:
-                            used_scores = []
-                            avg_score = None
-                            hcp_val = 0.0
-                            method = f"Insufficient rounds ({len(all_eligible)}/3 completed). A minimum of 3 rounds is required to establish a handicap. Defaulting to 0.0."
-                        else:
-                            last_scores = all_eligible.head(4)['Total_Score'].tolist()
-                            sorted_scores = sorted(last_scores)
-                            used_scores = sorted_scores[:3]  
-                            avg_score = sum(used_scores) / 3
-                            hcp_val = round(avg_score - 36, 1)
-                        if hcp_val > 16.0:
-                            hcp_val = 16.0
-                            method = f"Best 3 of last 4 eligible rounds (Capped at 16.0)"
-
-                        st.divider()
-                        st.markdown("### Handicap Breakdown Result")
-                        st.write(f"**Player:** {sel_player}")
-                        st.write(f"**Target Week:** {sel_week}")
-                        st.write(f"**Method:** {method}")
-                        if avg_score is not None:
-                            st.write(f"**Used Scores:** {used_scores}")
-                            st.write(f"**Average Gross (used):** {avg_score:.2f}")
-                            st.write(f"**Calculated Handicap:** **{hcp_val}** (computed as average gross − 36)")
-                        else:
-                            st.write("No scores available to compute an average. Handicap set to **0.0** by default.")
+                st.divider()
+                st.markdown("### Handicap Breakdown Result")
+                st.write(f"**Player:** {sel_player}")
+                st.write(f"**Target Week:** {'12-A' if sel_week == 121 else ('12-B' if sel_week == 122 else sel_week)}")
+                if result.empty:
+                    st.write("No rounds recorded for this player. Handicap set to **0.0** by default.")
+                else:
+                    hcp_val = result['Handicap'].iloc[0]
+                    st.write(f"**Method:** {result['Method'].iloc[0]}")
+                    st.write(f"**Eligible Rounds:** {result['Eligible_Rounds'].iloc[0]}")
+                    if not used.empty:
+                        avg_score = used['Total_Score'].mean()
+                        st.write(f"**Used Scores:** {used['Total_Score'].astype(int).tolist()}")
+                        st.write(f"**Average Gross (used):** {avg_score:.2f}")
+                    st.write(f"**Applied Handicap:** **{format_handicap(hcp_val)}**")
+
+                with st.expander("Rounds Before This Week (used / dropped / excluded)", expanded=True):
+                    if p_rounds.empty:
+                        st.write("No rounds recorded prior to the selected target week.")
+                    else:
+                        rounds_display = p_rounds[['Week', 'Total_Score', 'Status', 'Reason']].copy()
+                        rounds_display['Week'] = week_labels(rounds_display['Week'])
+                        st.dataframe(rounds_display, use_container_width=True, hide_index=True)
+
+                # Full league audit (every player x target week) for offline review
+                st.download_button(
+                    "📥 Download Full Handicap Audit (CSV)",
+                    data=audit_rounds.merge(audit_summary, on=['Player', 'Target_Week'], how='left').to_csv(index=False),
+                    file_name="ggg_handicap_audit.csv",
+                    mime="text/csv",
+                    use_container_width=True
+                )
 
-                        with st.expander("Detailed Rounds Table (marking used rounds)"):
-                            combined = pd.concat([pre_season, regular_rounds]).drop_duplicates().sort_values('Week', ascending=False)
-                            if combined.empty:
-                                st.write("No rounds to display.")
-                            else:
-                                combined_display = combined[['Week', 'Total_Score', 'DNF']].reset_index(drop=True).copy()
-                                def mark_used(row):
-                                    try:
-                                        return row['Total_Score'] in used_scores
-                                    except Exception:
-                                        return False
-                                combined_display['UsedInCalc'] = combined_display.apply(mark_used, axis=1)
-                                st.dataframe(combined_display, use_container_width=True, hide_index=True)
-
-                        st.markdown(
-                            "If you believe a round was incorrectly included or excluded, please contact the Rules and Players Committee. "
-                            "Rounds from special event weeks (e.g., scrambles or team events) are excluded from handicap calculations by league policy."
-                        )
-                    except Exception as e:
-                        st.error(f"Error computing handicap breakdown: {e}")
+                st.markdown(
+                    "If you believe a round was incorrectly included or excluded, please contact the Rules and Players Committee. "
+                    "Rounds from special event weeks (e.g., scrambles or team events) are excluded from handicap calculations by league policy."
+                )
 
     elif info_category == "Rules":
         st.subheader("League Rules and Format")
@@ -1033,9 +1529,8 @@ with tabs[5]: # League Info
         """)
 
         # --- The Image Rotation & Display ---
-        img = Image.open("newscorecard.jpg")
-        rotated_img = img.rotate(90, expand=True)  # -90 rotates it 90 degrees right
-        st.image(rotated_img, width=400, caption="Example of a correctly marked scorecard")
+        # Pre-rotated and resized once by the asset pipeline
+        st.image(app_image("newscorecard.jpg", "mobile"), width=400, caption="Example of a correctly marked scorecard")
 
         # --- Third Markdown Block ---
         st.markdown("""
@@ -1100,20 +1595,13 @@ with tabs[5]: # League Info
 
     elif info_category == "Schedule":
         st.subheader("📅 2026 Season Schedule")
-        courses = ["Dretzka", "Currie", "Whitnall", "Brown Deer", "Oakwood", "Dretzka", "Currie", "Brown Deer", "Whitnall", "Oakwood", "Dretzka", "Brown Deer", "Grant"]
-        league_start = pd.to_datetime("2026-05-31")
-        
-        schedule_data = []
-        for i in range(1, 14):
-            current_date = league_start + pd.Timedelta(weeks=i-1)
-            course_name = courses[i-1] 
-            if i == 4: note = "GGG Event- 2 Man Team Greensome (18 holes)"
-            elif i == 8: note = "GGG Event- 4 Man Team Scramble (18 holes)"
-            elif i == 12: note = "GGG Event- Double Points (18 holes)"
-            else: note = "Regular Round"
-            schedule_data.append({"Week": f"Week {i}", "Date": current_date.strftime('%B %d, %Y'), "Course": course_name, "Note": note})
+        schedule_data = [
+            {"Week": f"Week {row['Label']}", "Date": row['Play_Date'].strftime('%B %d, %Y'), "Course": row['Course'], "Note": row['Format']}
+            for row in SEASON_CALENDAR.schedule()
+        ]
         
-        schedule_data.append({"Week": "FINALE", "Date": "August 28, 2026", "Course": "TBD", "Note": "GGG Event- GGGolf Finale & Friends & Family Picnic"})
+        finale = SEASON_CALENDAR.finale
+        schedule_data.append({"Week": "FINALE", "Date": finale['date'].strftime('%B %d, %Y'), "Course": finale['course'], "Note": finale['format']})
 
         for entry in schedule_data:
             is_event = "GGG Event" in entry['Note']
@@ -1219,18 +1707,10 @@ with tabs[5]: # League Info
         for i, prize in enumerate(prizes):
             with cols[i % 2]:
                 with st.container(border=True):
-                    image_to_display = prize["img"]
-                    if prize["img"] == "GGGopenBanner2.jpg":
-                        img = Image.open("GGGopenBanner2.jpg")
-                        image_to_display = img.rotate(-90, expand=True)
-                    elif prize["img"] == "radgolfgps.jpg":
-                        img = Image.open("radgolfgps.jpg")
-                        image_to_display = img.rotate(90, expand=True)
-                    elif prize["img"] == "ForezoBallMarkers.jpg":
-                        img = Image.open("ForezoBallMarkers.jpg")
-                        image_to_display = img.rotate(-90, expand=True)
-
-                    st.image(image_to_display, use_container_width=True)
+                    # Rotations and resizing are done once by the asset pipeline (see ASSET_ROTATIONS)
+                    image_to_display = app_image(prize["img"], "mobile")
+                    if image_to_display:
+                        st.image(image_to_display, use_container_width=True)
                     st.caption(prize["desc"])
                        
     elif info_category == "Expenses":
@@ -1238,9 +1718,8 @@ with tabs[5]: # League Info
         st.write("Breakdown of league fees and administrative costs.")
 
         try:
-            # SUPABASE READ
-            response = conn.table("expenses").select("*").execute()
-            expenses_df = pd.DataFrame(response.data) if response.data else pd.DataFrame(columns=["prize", "cost"])
+            expense_data = get_table(EXPENSES_TABLE)
+            expenses_df = pd.DataFrame(expense_data) if expense_data else pd.DataFrame(columns=["prize", "cost"])
             expenses_df = expenses_df.dropna(how='all')
         except Exception as e:
             st.error(f"Error loading expenses: {e}")
@@ -1254,10 +1733,9 @@ with tabs[5]: # League Info
                     if prize_desc:
                         new_entry = {"prize": prize_desc.strip(), "cost": float(prize_cost)}
                         try:
-                            conn.table("expenses").insert(new_entry).execute()
-                            st.cache_data.clear()
-                            st.success(f"Saved: {prize_desc}")
-                            time.sleep(0.5)
+                            repo.add_expense(new_entry)
+                            invalidate_tables(EXPENSES_TABLE)
+                            flash(f"Saved: {prize_desc}")
                             st.rerun()
                         except Exception as e:
                             st.error(f"⚠️ Database Error: {e}")
@@ -1334,9 +1812,8 @@ with tabs[5]: # League Info
         st.subheader("🤝 Season Bets")
         
         try:
-            # Standard Supabase Read
-            response = conn.table("bets").select("*").execute()
-            bets_df = pd.DataFrame(response.data) if response.data else pd.DataFrame(columns=["id", "player_1", "player_2", "wager", "terms", "status"])
+            bet_data = get_table(BETS_TABLE)
+            bets_df = pd.DataFrame(bet_data) if bet_data else pd.DataFrame(columns=["id", "player_1", "player_2", "wager", "terms", "status"])
         except Exception as e:
             st.error(f"Error loading bets: {e}")
             bets_df = pd.DataFrame(columns=["id", "player_1", "player_2", "wager", "terms", "status"])
@@ -1359,10 +1836,9 @@ with tabs[5]: # League Info
                             "status": "⏳ Pending"
                         }
                         try:
-                            conn.table("bets").insert(new_bet).execute()
-                            st.cache_data.clear()
-                            st.success("Bet saved to database!")
-                            time.sleep(0.5)
+                            repo.add_bet(new_bet)
+                            invalidate_tables(BETS_TABLE)
+                            flash("Bet saved to database!")
                             st.rerun()
                         except Exception as e:
                             st.error(f"Save Error: {e}")
@@ -1388,10 +1864,9 @@ with tabs[5]: # League Info
                 
                 if st.button("Update Status"):
                     try:
-                        conn.table("bets").update({"status": new_status}).eq("id", bet_to_update["id"]).execute()
-                        st.cache_data.clear()
-                        st.success("Status Updated!")
-                        time.sleep(0.5)
+                        repo.set_bet_status(bet_to_update["id"], new_status)
+                        invalidate_tables(BETS_TABLE)
+                        flash("Status Updated!")
                         st.rerun()
                     except Exception as e:
                         st.error(f"Update Error: {e}")
@@ -1403,16 +1878,15 @@ with tabs[5]: # League Info
         st.write("Find your assigned playing group for the week. Note: Pairings exclude GGG Events (Weeks 4, 8, and 12).")
 
         try:
-            # Fetch pairings from Supabase
-            response = conn.table("weekly_pairings").select("*").execute()
-            pairings_df = pd.DataFrame(response.data) if response.data else pd.DataFrame(columns=["week", "group_id", "players"])
+            pairing_data = get_table(PAIRINGS_TABLE)
+            pairings_df = pd.DataFrame(pairing_data) if pairing_data else pd.DataFrame(columns=["week", "group_id", "players"])
         except Exception as e:
             st.error(f"Error loading pairings: {e}")
             pairings_df = pd.DataFrame(columns=["week", "group_id", "players"])
 
         if not pairings_df.empty:
             # Filter out GGG Event weeks
-            pairings_df = pairings_df[~pairings_df['week'].isin([4, 8, 12])]
+            pairings_df = pairings_df[~pairings_df['week'].isin(SEASON_CALENDAR.event_weeks)]
             
             weeks_available = sorted(pairings_df['week'].unique())
             if weeks_available:
@@ -1436,7 +1910,7 @@ with tabs[5]: # League Info
         else:
             st.info("Pairings have not been posted yet.")
                         
-with tabs[6]: # Registration
+def render_registration():
     st.header("👤 Registration")
     
     if not st.session_state.get("reg_access"):
@@ -1448,8 +1922,7 @@ with tabs[6]: # Registration
             if submit_key:
                 if user_key == REGISTRATION_KEY:
                     st.session_state["reg_access"] = True
-                    st.success("Key Accepted! Please provide your details below.")
-                    time.sleep(1)
+                    flash("Key Accepted! Please provide your details below.", icon="🔓")
                     st.rerun()
                 else:
                     st.error("❌ Invalid League Key. Please contact an Officer.")
@@ -1483,14 +1956,14 @@ with tabs[6]: # Registration
                         }
                         
                         # SUPABASE INSERT
-                        conn.table("league_scores_2026").insert(new_reg).execute()
-                        st.success("Registration complete!")
-                        time.sleep(1)
+                        repo.insert_score(stamp_scores_row(new_reg))
+                        invalidate_tables(SCORES_TABLE)
+                        flash("Registration complete!")
                         st.rerun()
                     except Exception as e:
                         st.error(f"Error during registration: {e}")
 
-with tabs[7]: # Admin
+def render_admin():
     st.header("⚙️ Admin Control Panel")
     
     if not st.session_state.get("authenticated"):
@@ -1503,40 +1976,47 @@ with tabs[7]: # Admin
             if submit_admin:
                 if admin_input == ADMIN_PASSWORD:
                     st.session_state["authenticated"] = True
-                    st.success("Access Granted!")
-                    time.sleep(1)
+                    flash("Access Granted!", icon="🔓")
                     st.rerun()
                 else:
                     st.error("❌ Incorrect Admin Password.")
 
     else:
         st.subheader("Leaderboard Management")
-        st.warning("⚠️ Warning: Resetting the live board will delete all current scores. This action cannot be undone.")
+        st.warning("⚠️ Warning: Resetting a live round will delete all of its scores. This action cannot be undone.")
+
+        reset_week = st.selectbox(
+            "Live round to reset",
+            options=list(range(LIVE_WEEK, 0, -1)),
+            format_func=lambda w: f"Week {w}" + (" (Live)" if w == LIVE_WEEK else ""),
+            key="live_reset_week"
+        )
 
         # Safety Lock for Reset
-        confirm_reset = st.checkbox("I confirm that I want to delete all LIVE SCORES.")
+        confirm_reset = st.checkbox(f"I confirm that I want to delete all LIVE SCORES for Week {reset_week}.")
         
         if confirm_reset:
-            if st.button("🚨 DELETE ALL LIVE SCORES", use_container_width=True, type="primary"):
+            if st.button(f"🚨 DELETE WEEK {reset_week} LIVE SCORES", use_container_width=True, type="primary"):
                 try:
-                    # Target correct table and force delete
-                    conn.table("live_scores").delete().neq("id", 0).execute()
+                    # Only this round's rows; other weeks are untouched
+                    repo.clear_live_scores(reset_week)
+                    invalidate_live_board(reset_week, full=True)
                     
-                    st.cache_data.clear()
-                    st.success("✅ Live Round has been reset!")
-                    time.sleep(1.5)
+                    flash(f"Week {reset_week} live round has been reset!")
                     st.rerun()
                 except Exception as e:
                     st.error(f"Failed to reset table: {e}")
         else:
-            st.button("🚨 DELETE ALL LIVE SCORES", use_container_width=True, disabled=True)
+            st.button(f"🚨 DELETE WEEK {reset_week} LIVE SCORES", use_container_width=True, disabled=True)
 
         st.divider()
         
         col1, col2 = st.columns(2)
         with col1:
             if st.button("🔄 Refresh Data Cache", use_container_width=True):
-                st.cache_data.clear()
+                # Full resync of the scores plus a refetch of every secondary table; cached results rebuild only where data changed
+                expire_scores_snapshot(full=True)
+                invalidate_tables(*SECONDARY_TABLES)
                 st.toast("App data synced with database.")
         
         with col2:
@@ -1544,22 +2024,161 @@ with tabs[7]: # Admin
                 st.session_state["authenticated"] = False
                 st.rerun()
 
+        if st.button("🧮 Rebuild Handicap Table", use_container_width=True):
+            # Recompute every player x target week and rewrite the stored table in one batched upsert
+            try:
+                scores = load_data()
+                matrix = handicap_matrix(scores)
+                matrix.attrs["versions"] = dict(scores.attrs.get("versions", {}))
+                repo.upsert_handicaps(handicap_rows(matrix))
+                _scores_snapshot()["handicaps"] = matrix
+                st.toast(f"Handicap table rebuilt for {len(matrix)} players.")
+            except Exception as e:
+                st.error(f"Failed to rebuild handicaps: {e}")
+
+        st.divider()
+        st.subheader("📥 Bulk Import")
+        st.write("Load a paper-scorecard night, a pre-season migration or a season of pairings from one CSV. Valid rows are written in batches; rejected rows are listed below with the reason.")
+
+        import_kind = st.segmented_control("Import", list(IMPORT_KINDS), default="Rounds", key="import_kind") or "Rounds"
+        spec = IMPORT_KINDS[import_kind]
+        st.caption(
+            f"Required columns: **{', '.join(spec['required'])}**"
+            + (f" | Optional: {', '.join(spec['optional'])}" if spec['optional'] else "")
+        )
+        st.download_button(
+            f"📄 {import_kind} CSV Template", data=import_template(import_kind),
+            file_name=f"ggg_{import_kind.lower()}_template.csv", mime="text/csv", use_container_width=True
+        )
+        upload = st.file_uploader("Upload CSV", type=["csv"], key=f"import_file_{import_kind}")
+
+        if upload is not None:
+            try:
+                frame = read_import_csv(upload)
+            except Exception as e:
+                frame = None
+                st.error(f"Could not read CSV: {e}")
+
+            if frame is not None:
+                if import_kind == "Rounds":
+                    rows, errors = validate_rounds(frame, EXISTING_PLAYERS, get_handicap_matrix(), MASTER_COLUMNS)
+                elif import_kind == "Registrations":
+                    rows, errors = validate_registrations(frame, EXISTING_PLAYERS, MASTER_COLUMNS)
+                else:
+                    # Weeks in the file that already have published groups: rejected unless the admin replaces them
+                    live_pairings = pd.DataFrame(get_table(PAIRINGS_TABLE), columns=["week", "group_id", "players"])
+                    upload_weeks = {parse_import_week(w) for w in frame.get("week", [])}
+                    live_pairings = live_pairings[live_pairings['week'].isin(upload_weeks)]
+                    replace_weeks = []
+                    if not live_pairings.empty:
+                        live_weeks = sorted(live_pairings['week'].unique().tolist())
+                        if st.checkbox(f"Replace the pairings already published for Week(s) {', '.join(map(str, live_weeks))}", key="import_pairing_replace"):
+                            replace_weeks = live_weeks
+                    rows, errors = validate_pairings(
+                        frame, EXISTING_PLAYERS, live_pairings[~live_pairings['week'].isin(replace_weeks)].to_dict("records")
+                    )
+
+                st.write(f"**{len(rows)}** row(s) ready to import, **{len(errors)}** rejected.")
+                if errors:
+                    error_df = pd.DataFrame(errors)
+                    st.dataframe(error_df, use_container_width=True, hide_index=True)
+                    st.download_button(
+                        "📥 Download Error Report", data=error_df.to_csv(index=False),
+                        file_name=f"ggg_{import_kind.lower()}_import_errors.csv", mime="text/csv", use_container_width=True
+                    )
+                if rows:
+                    with st.expander(f"Preview {len(rows)} row(s)"):
+                        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
+                    if st.button(f"✅ Import {len(rows)} {import_kind}", type="primary", use_container_width=True):
+                        try:
+                            # One request per IMPORT_BATCH_SIZE rows instead of one per form submission
+                            if import_kind == "Pairings":
+                                # Replaced weeks lose their old groups only once every batch is in
+                                repo.replace_pairings(replace_weeks, import_batches(rows))
+                            else:
+                                for batch in import_batches(rows):
+                                    repo.upsert_scores([stamp_scores_row(dict(r)) for r in batch])
+
+                            invalidate_tables(PAIRINGS_TABLE if import_kind == "Pairings" else SCORES_TABLE)
+                            if import_kind == "Rounds":
+                                changes = {}
+                                for r in rows:
+                                    changes.setdefault(r['Player'], []).append(r['Week'])
+                                try:
+                                    persist_handicaps(changes)
+                                except Exception as e:
+                                    flash(f"Handicap table not updated: {e}", icon="⚠️")
+
+                            flash(f"Imported {len(rows)} {import_kind.lower()}!")
+                            st.rerun()
+                        except Exception as e:
+                            st.error(f"❌ Import failed: {e}")
+
         st.divider()
         st.subheader("👥 Manage Player Pairings")
-        st.write("Manually create and publish groups for non-event weeks.")
-        
+        st.write("Generate a whole week of foursomes automatically, or manually create and publish groups for non-event weeks.")
+
+        with st.expander("🤖 Generate Week Pairings", expanded=True):
+            pairing_weeks = SEASON_CALENDAR.pairing_weeks
+            next_pairing_week = next((w for w in pairing_weeks if w >= LIVE_WEEK), pairing_weeks[-1])
+            col_g1, col_g2 = st.columns(2)
+            gen_week = col_g1.selectbox("Week", pairing_weeks, index=pairing_weeks.index(next_pairing_week), key="gen_pairing_week")
+            balance_hcp = col_g2.toggle("Balance handicaps", value=True, key="gen_pairing_balance")
+            gen_players = st.multiselect("Players to pair (remove anyone sitting out)", EXISTING_PLAYERS, default=EXISTING_PLAYERS, key="gen_pairing_players")
+
+            if st.button("🔀 Generate Preview", use_container_width=True):
+                try:
+                    pairings_df = pd.DataFrame(get_table(PAIRINGS_TABLE), columns=["week", "group_id", "players"])
+                    # Repeat pairings are scored against every earlier week already published
+                    history = pairing_history(pairings_df[pairings_df['week'] < gen_week], gen_players)
+                    week_hcps = get_handicap_matrix()[gen_week].to_dict() if balance_hcp else None
+                    groups, repeats = optimize_pairings(gen_players, history, week_hcps, seed=secrets.randbits(32))
+                    st.session_state["pairing_preview"] = {
+                        "week": gen_week, "groups": groups, "repeats": repeats,
+                        "existing": int((pairings_df['week'] == gen_week).sum()), "handicaps": week_hcps,
+                    }
+                except Exception as e:
+                    st.error(f"Error generating pairings: {e}")
+
+            preview = st.session_state.get("pairing_preview")
+            if preview and preview["week"] == gen_week:
+                hcps = preview["handicaps"] or get_handicap_matrix()[gen_week].to_dict()
+                st.dataframe(pd.DataFrame([
+                    {"Group": g, "Players": ", ".join(grp), "Avg HCP": round(sum(hcps.get(p, 0.0) for p in grp) / len(grp), 1)}
+                    for g, grp in enumerate(preview["groups"], start=1)
+                ]), use_container_width=True, hide_index=True)
+                st.caption(f"{len(preview['groups'])} groups, {preview['repeats']} repeat pairing(s) with earlier weeks.")
+
+                replace = True
+                if preview["existing"]:
+                    replace = st.checkbox(f"Replace the {preview['existing']} group(s) already published for Week {gen_week}", key="gen_pairing_replace")
+                if st.button(f"✅ Publish Week {gen_week} Pairings", type="primary", use_container_width=True, disabled=not replace):
+                    try:
+                        # The new groups land before the old ones are dropped, so a failed publish keeps the week's groups
+                        repo.replace_pairings([gen_week], [[
+                            {"week": int(gen_week), "group_id": g, "players": ", ".join(grp)}
+                            for g, grp in enumerate(preview["groups"], start=1)
+                        ]])
+                        invalidate_tables(PAIRINGS_TABLE)
+                        st.session_state.pop("pairing_preview", None)
+                        flash(f"Published {len(preview['groups'])} groups for Week {gen_week}!")
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"Error publishing pairings: {e}")
+
         with st.expander("➕ Add New Group Pairing"):
             with st.form("add_pairing_form", clear_on_submit=True):
                 col_p1, col_p2 = st.columns(2)
-                p_week = col_p1.number_input("Week Number", min_value=1, max_value=14, step=1)
+                p_week = col_p1.number_input("Week Number", min_value=1, max_value=SEASON_CALENDAR.base_weeks[-1], step=1)
                 p_group = col_p2.number_input("Group Number (e.g., 1 for Group 1)", min_value=1, step=1)
                 
                 # Multi-select pulls directly from your existing dynamic player list
                 selected_players = st.multiselect("Select Players for this Group", options=EXISTING_PLAYERS)
                 
                 if st.form_submit_button("Save Group", type="primary"):
-                    if p_week in [4, 8, 12]:
-                        st.error("Weeks 4, 8, and 12 are GGG Events. Pairings are not required for these weeks.")
+                    if SEASON_CALENDAR.is_event(p_week):
+                        st.error(f"Week {p_week} is a GGG Event ({SEASON_CALENDAR.week(p_week)['Format']}). Pairings are not required for event weeks.")
                     elif not selected_players:
                         st.warning("Please select at least one player.")
                     else:
@@ -1570,10 +2189,56 @@ with tabs[7]: # Admin
                             "players": players_str
                         }
                         try:
-                            conn.table("weekly_pairings").insert(new_pairing).execute()
-                            st.cache_data.clear()
-                            st.success(f"Group {p_group} saved for Week {p_week}!")
-                            time.sleep(1)
+                            repo.add_pairing(new_pairing)
+                            invalidate_tables(PAIRINGS_TABLE)
+                            flash(f"Group {p_group} saved for Week {p_week}!")
                             st.rerun()
                         except Exception as e:
                             st.error(f"Error saving pairing: {e}")
+
+        st.divider()
+        st.subheader("⏱️ Performance Profiler")
+        st.caption("Times every rerun on this server (all sessions): tab bodies, database queries, load_data, handicaps and image loads.")
+
+        st.toggle(
+            "Record timings", value=profiler.enabled, key="profiler_enabled",
+            on_change=lambda: set_profiling(st.session_state["profiler_enabled"])
+        )
+        recent_runs = profiler.recent_reruns()
+        if not recent_runs:
+            st.info("No reruns recorded yet. Turn on recording, then use the app.")
+        else:
+            st.markdown("**Recent Reruns**")
+            st.dataframe(pd.DataFrame(recent_runs), use_container_width=True, hide_index=True)
+            st.markdown("**Slowest Spans**")
+            st.dataframe(pd.DataFrame(profiler.slowest_spans()), use_container_width=True, hide_index=True)
+
+        query_stats = profiler.query_stats()
+        if query_stats:
+            st.markdown("**Database Queries**")
+            st.dataframe(pd.DataFrame(query_stats), use_container_width=True, hide_index=True)
+
+        if st.button("🧹 Clear Timings", use_container_width=True):
+            profiler.reset()
+            st.rerun()
+
+# --- 5. TAB NAVIGATION ---
+# Lazy tabs: only the selected tab's body runs (and fires its Supabase queries) on each rerun
+APP_TABS = [
+    ("📝 Scorecard", render_scorecard),
+    ("🏆 Standings", render_standings),
+    ("📅 History", render_history),
+    ("⛳ Live Scoring", render_live_scoring),
+    ("🏁 GGG Challenge", render_challenge),
+    ("ℹ️ League Info", render_league_info),
+    ("👤 Registration", render_registration),
+    ("⚙️ Admin", render_admin),
+]
+
+tabs = st.tabs([label for label, _ in APP_TABS], key="main_tabs", on_change="rerun")
+for tab, (label, render_tab) in zip(tabs, APP_TABS):
+    if tab.open:
+        with tab, profiler.span(f"tab {label}"):
+            render_tab()
+
+profiler.end()
@@ -0,0 +1,469 @@
+# --------------------------------------------------------------- GGG GOLF DATA ACCESS ---------------------------------------------------------------
+# Every table read/write the app makes goes through LeagueRepository. The repository talks to a backend:
+#   SupabaseBackend - the live league database (wraps st.connection("supabase") or a supabase client)
+#   SQLiteBackend   - a local file or in-memory stand-in with the same semantics (incl. on_conflict upserts)
+# so hot paths can be benchmarked and regression-tested offline without a Supabase project.
+# Every call goes through bounded retries with jittered backoff and a shared circuit breaker (see RESILIENCE).
+import datetime
+import random
+import sqlite3
+import threading
+import time
+
+try:
+    import httpx
+except ImportError:  # Only the Supabase client pulls it in
+    httpx = None
+
+SCORES_TABLE = "league_scores_2026"
+LIVE_TABLE = "live_scores"
+CHALLENGE_TABLE = "ChallengeRegistrations"
+EXPENSES_TABLE = "expenses"
+BETS_TABLE = "bets"
+PAIRINGS_TABLE = "weekly_pairings"
+HANDICAPS_TABLE = "league_handicaps_2026"
+
+LIVE_CONFLICT = "week,player_name,hole_number"
+
+# Local mirror of the Supabase tables: column -> python type, plus the key upserts resolve against.
+# "id" columns are auto-assigned; "updated_at" defaults to the write time like the Postgres default.
+# "indexes" mirror the ones in supabase_migrations.sql.
+TABLES = {
+    SCORES_TABLE: {
+        "columns": {
+            "Week": int, "Player": str, "PIN": str, "Pars_Count": int, "Birdies_Count": int,
+            "Eagle_Count": int, "Total_Score": int, "Handicap": float, "Net_Score": float,
+            "DNF": bool, "Acknowledged": bool, "League Fee Paid": bool, "updated_at": str,
+        },
+        # Upserts resolve on the UNIQUE (Week, Player) key; History filters the loaded frame, not the table
+        "key": ["Week", "Player"],
+    },
+    LIVE_TABLE: {
+        "columns": {"id": int, "week": int, "player_name": str, "hole_number": int, "score": int, "updated_at": str},
+        "key": ["week", "player_name", "hole_number"],
+        # Every live read is scoped to one round: full board by week, polls by week + updated_at
+        "indexes": [["week", "updated_at"]],
+    },
+    CHALLENGE_TABLE: {
+        "columns": {"id": int, "PlayerName": str, "ChallengeName": str, "RegistrationDate": str, "Paid": bool},
+        "key": ["id"],
+    },
+    EXPENSES_TABLE: {
+        "columns": {"id": int, "prize": str, "cost": float},
+        "key": ["id"],
+    },
+    BETS_TABLE: {
+        "columns": {"id": int, "player_1": str, "player_2": str, "wager": str, "terms": str, "status": str},
+        "key": ["id"],
+    },
+    PAIRINGS_TABLE: {
+        "columns": {"id": int, "week": int, "group_id": int, "players": str},
+        "key": ["id"],
+    },
+    # Materialized handicap per player per target week (121/122 included), kept current on every score write
+    HANDICAPS_TABLE: {
+        "columns": {"Player": str, "Week": int, "Handicap": float, "updated_at": str},
+        "key": ["Player", "Week"],
+    },
+}
+
+SQL_TYPES = {int: "INTEGER", float: "REAL", str: "TEXT", bool: "INTEGER"}
+
+
+def utc_now():
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+def _as_rows(rows):
+    return [rows] if isinstance(rows, dict) else list(rows)
+
+
+def _q(name):
+    return f'"{name}"'
+
+
+# --- BACKENDS ---
+# Filters are plain dicts: eq={"week": 3}, gte={"updated_at": cursor}, neq={"id": 0}, in_={"id": [4, 5]}
+
+class SupabaseBackend:
+    def __init__(self, client):
+        self.client = client
+
+    def _filtered(self, query, eq=None, gte=None, neq=None, in_=None):
+        for col, val in (eq or {}).items():
+            query = query.eq(col, val)
+        for col, val in (gte or {}).items():
+            query = query.gte(col, val)
+        for col, val in (neq or {}).items():
+            query = query.neq(col, val)
+        for col, vals in (in_ or {}).items():
+            query = query.in_(col, list(vals))
+        return query
+
+    def select(self, table, columns="*", eq=None, gte=None, neq=None, in_=None):
+        query = self._filtered(self.client.table(table).select(columns), eq, gte, neq, in_)
+        return query.execute().data or []
+
+    def insert(self, table, rows):
+        return self.client.table(table).insert(rows).execute().data or []
+
+    def upsert(self, table, rows, on_conflict=None):
+        if on_conflict:
+            return self.client.table(table).upsert(rows, on_conflict=on_conflict).execute().data or []
+        return self.client.table(table).upsert(rows).execute().data or []
+
+    def update(self, table, values, eq=None):
+        return self._filtered(self.client.table(table).update(values), eq).execute().data or []
+
+    def delete(self, table, eq=None, neq=None, in_=None):
+        return self._filtered(self.client.table(table).delete(), eq, neq=neq, in_=in_).execute().data or []
+
+
+class SQLiteBackend:
+    def __init__(self, path=":memory:", tables=None):
+        self.tables = tables or TABLES
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        with self.lock, self.db:
+            for table, spec in self.tables.items():
+                self.db.execute(self._ddl(table, spec))
+                for cols in spec.get("indexes", []):
+                    self.db.execute(f"CREATE INDEX IF NOT EXISTS {_q(table + '_' + '_'.join(cols) + '_idx')} "
+                                    f"ON {_q(table)} ({', '.join(map(_q, cols))})")
+        # Columns reads may name: the spec's, as far as the file actually has them (an older file may lack some)
+        self.columns = {
+            table: {r["name"] for r in self.db.execute(f"PRAGMA table_info({_q(table)})")} & set(spec["columns"])
+            for table, spec in self.tables.items()
+        }
+
+    def _ddl(self, table, spec):
+        cols = []
+        for col, typ in spec["columns"].items():
+            if col == "id":
+                cols.append(f"{_q(col)} INTEGER PRIMARY KEY AUTOINCREMENT")
+            else:
+                cols.append(f"{_q(col)} {SQL_TYPES[typ]}")
+        if spec["key"] != ["id"]:
+            cols.append(f"UNIQUE ({', '.join(map(_q, spec['key']))})")
+        return f"CREATE TABLE IF NOT EXISTS {_q(table)} ({', '.join(cols)})"
+
+    def _spec(self, table):
+        if table not in self.tables:
+            raise KeyError(f"Unknown table: {table}")
+        return self.tables[table]
+
+    def _encode(self, spec, row, stamp=True):
+        # "now()" means the write time, same as Postgres; inserts default updated_at when the caller leaves it out
+        row = dict(row)
+        if "updated_at" in spec["columns"] and (row.get("updated_at") == "now()" or (stamp and "updated_at" not in row)):
+            row["updated_at"] = utc_now()
+        for col in row:
+            if col not in spec["columns"]:
+                raise KeyError(f"Unknown column {col!r}")
+        return row
+
+    def _decode(self, spec, row):
+        out = {}
+        for col, val in dict(row).items():
+            typ = spec["columns"].get(col)
+            out[col] = typ(val) if val is not None and typ in (bool, int, float) else val
+        return out
+
+    def _column(self, table, col):
+        # SQLite reads an unknown double-quoted identifier as a string literal; raise like PostgREST's 42703 instead
+        if col not in self.columns[table]:
+            raise sqlite3.OperationalError(f"no such column: {col}")
+        return _q(col)
+
+    def _where(self, table, eq=None, gte=None, neq=None, in_=None):
+        clauses, params = [], []
+        for op, filters in (("=", eq), (">=", gte), ("!=", neq)):
+            for col, val in (filters or {}).items():
+                clauses.append(f"{self._column(table, col)} {op} ?")
+                params.append(val)
+        for col, vals in (in_ or {}).items():
+            vals = list(vals)
+            clauses.append(f"{self._column(table, col)} IN ({', '.join('?' * len(vals))})")
+            params.extend(vals)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _fetch(self, table, spec, where, params):
+        cur = self.db.execute(f"SELECT * FROM {_q(table)}{where}", params)
+        return [self._decode(spec, r) for r in cur.fetchall()]
+
+    def select(self, table, columns="*", eq=None, gte=None, neq=None, in_=None):
+        spec = self._spec(table)
+        where, params = self._where(table, eq, gte, neq, in_)
+        cols = "*" if columns.strip() == "*" else ", ".join(self._column(table, c.strip().strip('"')) for c in columns.split(","))
+        with self.lock:
+            cur = self.db.execute(f"SELECT {cols} FROM {_q(table)}{where} ORDER BY rowid", params)
+            return [self._decode(spec, r) for r in cur.fetchall()]
+
+    def _write(self, table, rows, conflict=None):
+        spec = self._spec(table)
+        written = []
+        with self.lock, self.db:
+            for row in _as_rows(rows):
+                row = self._encode(spec, row)
+                cols = list(row)
+                sql = f"INSERT INTO {_q(table)} ({', '.join(map(_q, cols))}) VALUES ({', '.join('?' * len(cols))})"
+                if conflict:
+                    updates = [c for c in cols if c not in conflict]
+                    target = ", ".join(map(_q, conflict))
+                    if updates:
+                        sql += f" ON CONFLICT ({target}) DO UPDATE SET " + \
+                               ", ".join(f"{_q(c)} = excluded.{_q(c)}" for c in updates)
+                    else:
+                        sql += f" ON CONFLICT ({target}) DO NOTHING"
+                self.db.execute(sql, [row[c] for c in cols])
+                # Hand back the stored row like PostgREST's return=representation
+                key = conflict or ["id"]
+                if all(c in row for c in key):
+                    where, params = self._where(table, eq={c: row[c] for c in key})
+                else:
+                    where, params = " WHERE rowid = last_insert_rowid()", []
+                written.extend(self._fetch(table, spec, where, params))
+        return written
+
+    def insert(self, table, rows):
+        return self._write(table, rows)
+
+    def upsert(self, table, rows, on_conflict=None):
+        # No on_conflict resolves against the table's key, the same as a Supabase upsert on the primary key
+        conflict = [c.strip() for c in on_conflict.split(",")] if on_conflict else self._spec(table)["key"]
+        return self._write(table, rows, conflict)
+
+    def update(self, table, values, eq=None):
+        spec = self._spec(table)
+        values = self._encode(spec, values, stamp=False)
+        where, params = self._where(table, eq)
+        with self.lock, self.db:
+            matched = self._fetch(table, spec, where, params)
+            self.db.execute(
+                f"UPDATE {_q(table)} SET " + ", ".join(f"{_q(c)} = ?" for c in values) + where,
+                list(values.values()) + params
+            )
+            return [{**r, **values} for r in matched]
+
+    def delete(self, table, eq=None, neq=None, in_=None):
+        spec = self._spec(table)
+        where, params = self._where(table, eq, neq=neq, in_=in_)
+        with self.lock, self.db:
+            matched = self._fetch(table, spec, where, params)
+            self.db.execute(f"DELETE FROM {_q(table)}{where}", params)
+            return matched
+
+
+# --- RESILIENCE ---
+RETRY_ATTEMPTS = 3          # Tries per call for transient failures
+RETRY_BASE_DELAY = 0.25     # Seconds; doubles every retry, full jitter
+RETRY_MAX_DELAY = 2.0
+RETRY_OPS = {"select", "upsert", "update", "delete"}  # Idempotent; a timed-out insert may have landed, so never resend it
+BREAKER_THRESHOLD = 3       # Consecutive failed calls that open the breaker
+BREAKER_COOLDOWN = 30       # Seconds the breaker stays open before one trial call is let through
+
+TRANSIENT_ERRORS = (ConnectionError, TimeoutError) + ((httpx.TransportError,) if httpx else ())
+TRANSIENT_CODES = {"408", "425", "429", "500", "502", "503", "504", "520", "PGRST000", "PGRST001", "PGRST002"}
+UNDEFINED_COLUMN_CODES = {"42703", "PGRST204"}   # Postgres undefined_column / PostgREST unknown column
+UNDEFINED_TABLE_CODES = {"42P01", "PGRST205"}    # Postgres undefined_table / PostgREST table not in the schema cache
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, until):
+        self.until = until
+        super().__init__(f"Database is cooling off after repeated errors; retrying after {time.strftime('%H:%M:%S', time.localtime(until))}.")
+
+
+def is_rate_limited(exc):
+    return str(getattr(exc, "code", "")) == "429" or "rate limit" in str(exc).lower()
+
+
+def is_transient(exc):
+    # Worth retrying: network trouble, rate limits, 5xx / gateway errors, a locked SQLite file.
+    # Bad requests (e.g. a missing column, in either backend) are not.
+    if isinstance(exc, sqlite3.OperationalError):
+        return "locked" in str(exc) or "busy" in str(exc)
+    return isinstance(exc, TRANSIENT_ERRORS) or str(getattr(exc, "code", "")) in TRANSIENT_CODES or is_rate_limited(exc)
+
+
+def is_undefined_column(exc):
+    # The request named a column the table does not have; the only error a projected select may fall back on
+    if str(getattr(exc, "code", "")) in UNDEFINED_COLUMN_CODES:
+        return True
+    return isinstance(exc, sqlite3.OperationalError) and "no such column" in str(exc)
+
+
+def is_missing_table(exc):
+    # The table has not been created yet, e.g. a migration that has not been run
+    if str(getattr(exc, "code", "")) in UNDEFINED_TABLE_CODES:
+        return True
+    return isinstance(exc, sqlite3.OperationalError) and "no such table" in str(exc)
+
+
+class CircuitBreaker:
+    # Shared by every session on the process. While open, calls fail fast with CircuitOpenError and callers
+    # serve their last good snapshot; cooling_until mirrors into st.session_state["api_cooling_until"].
+    # After the cooldown it is half-open: exactly one probe call goes through, everyone else keeps failing
+    # fast until the probe either closes it (success) or opens it for another cooldown (failure).
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.cooling_until = 0.0
+        self.tripped = False
+        self.probing = False
+
+    def is_open(self):
+        return time.time() < self.cooling_until
+
+    def check(self):
+        # True when this caller is the half-open probe
+        with self.lock:
+            if not self.tripped:
+                return False
+            if self.probing or time.time() < self.cooling_until:
+                raise CircuitOpenError(self.cooling_until)
+            self.probing = True
+            return True
+
+    def success(self):
+        with self.lock:
+            self.failures = 0
+            self.tripped = False
+            self.probing = False
+
+    def failure(self, trip=False):
+        # A rate limit or a failed probe opens it straight away; otherwise after `threshold` failures in a row
+        with self.lock:
+            self.failures += 1
+            if trip or self.probing or self.failures >= self.threshold:
+                self.tripped = True
+                self.probing = False
+                self.cooling_until = time.time() + self.cooldown
+
+
+# --- REPOSITORY ---
+
+class LeagueRepository:
+    def __init__(self, backend, breaker=None):
+        self.backend = backend
+        self.breaker = breaker or CircuitBreaker()
+        self.on_query = None  # Optional hook(table, op, rows, ms), e.g. the Admin profiler
+
+    def _run(self, op, table, *args, **kwargs):
+        probe = self.breaker.check()
+        # A probe is a single attempt, so a still-failing database re-opens the breaker without a retry burst
+        attempts = RETRY_ATTEMPTS if op in RETRY_OPS and not probe else 1
+        for attempt in range(attempts):
+            start = time.perf_counter()
+            try:
+                data = getattr(self.backend, op)(table, *args, **kwargs)
+            except Exception as e:
+                if not is_transient(e):
+                    # The database answered (e.g. a bad request), so it is reachable: settles a probe too
+                    self.breaker.success()
+                    raise
+                if is_rate_limited(e) or attempt == attempts - 1:
+                    self.breaker.failure(trip=is_rate_limited(e))
+                    raise
+                time.sleep(random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)))
+                continue
+            self.breaker.success()
+            if self.on_query is not None:
+                self.on_query(table, op, data, (time.perf_counter() - start) * 1000)
+            return data
+
+    # League scores (Week 0 rows are registrations)
+    def scores(self, changed_since=None, columns="*"):
+        if changed_since is None:
+            return self._run("select", SCORES_TABLE, columns)
+        # gte so same-timestamp writes are not missed
+        return self._run("select", SCORES_TABLE, columns, gte={"updated_at": changed_since})
+
+    def upsert_score(self, row):
+        return self._run("upsert", SCORES_TABLE, row)
+
+    def insert_score(self, row):
+        return self._run("insert", SCORES_TABLE, row)
+
+    def upsert_scores(self, rows):
+        # Bulk import: one request per batch, resolved on (Week, Player) like upsert_score
+        return self._run("upsert", SCORES_TABLE, rows)
+
+    # Live hole-by-hole scoring
+    def live_scores(self, week, changed_since=None, columns="*"):
+        if changed_since is None:
+            return self._run("select", LIVE_TABLE, columns, eq={"week": week})
+        return self._run("select", LIVE_TABLE, columns, eq={"week": week}, gte={"updated_at": changed_since})
+
+    def upsert_live_scores(self, rows):
+        return self._run("upsert", LIVE_TABLE, rows, on_conflict=LIVE_CONFLICT)
+
+    def clear_live_scores(self, week):
+        # Only the given round; other weeks' live scores are kept
+        return self._run("delete", LIVE_TABLE, eq={"week": week})
+
+    # GGG Challenge sign-ups
+    def challenge_registrations(self):
+        return self._run("select", CHALLENGE_TABLE)
+
+    def add_challenge_registration(self, row):
+        return self._run("insert", CHALLENGE_TABLE, row)
+
+    # League Info: expenses, bets, pairings
+    def expenses(self):
+        return self._run("select", EXPENSES_TABLE)
+
+    def add_expense(self, row):
+        return self._run("insert", EXPENSES_TABLE, row)
+
+    def bets(self):
+        return self._run("select", BETS_TABLE)
+
+    def add_bet(self, row):
+        return self._run("insert", BETS_TABLE, row)
+
+    def set_bet_status(self, bet_id, status):
+        return self._run("update", BETS_TABLE, {"status": status}, eq={"id": bet_id})
+
+    # Materialized handicaps
+    def handicaps(self):
+        return self._run("select", HANDICAPS_TABLE)
+
+    def upsert_handicaps(self, rows):
+        return self._run("upsert", HANDICAPS_TABLE, rows, on_conflict="Player,Week")
+
+    def pairings(self):
+        return self._run("select", PAIRINGS_TABLE)
+
+    def add_pairing(self, row):
+        return self._run("insert", PAIRINGS_TABLE, row)
+
+    def add_pairings(self, rows):
+        # A whole week of groups in one insert
+        return self._run("insert", PAIRINGS_TABLE, rows)
+
+    def clear_pairings(self, week):
+        return self._run("delete", PAIRINGS_TABLE, eq={"week": week})
+
+    def replace_pairings(self, weeks, batches):
+        # Publish first, then drop the weeks' old groups: a failed insert leaves what was published in place,
+        # and the batches already written are taken back, so a week is never emptied or half imported
+        weeks = [int(w) for w in weeks]
+        old = [r["id"] for r in self._run("select", PAIRINGS_TABLE, "id", in_={"week": weeks})] if weeks else []
+        written = []
+        try:
+            for batch in batches:
+                written.extend(self._run("insert", PAIRINGS_TABLE, batch))
+        except Exception as e:
+            if written:
+                try:
+                    self._run("delete", PAIRINGS_TABLE, in_={"id": [r["id"] for r in written]})
+                except Exception:
+                    raise RuntimeError(f"{e} ({len(written)} new pairing row(s) were written and could not be removed)") from e
+            raise
+        if old:
+            self._run("delete", PAIRINGS_TABLE, in_={"id": old})
+        return written
@@ -0,0 +1,721 @@
+# --------------------------------------------------------------- GGG GOLF LEAGUE ENGINE ---------------------------------------------------------------
+# Pure pandas/numpy league math used by golf_app.py. Nothing in here talks to Streamlit or Supabase,
+# so every function can be called (and timed) with a plain DataFrame.
+import bisect
+import datetime
+import hashlib
+import hmac
+import warnings
+from zoneinfo import ZoneInfo
+import numpy as np
+import pandas as pd
+
+# --- GGG POINTS ---
+GGG_POINTS = {
+    1: 100, 2: 77, 3: 64, 4: 54, 5: 47, 6: 41, 7: 36, 8: 31, 9: 27, 10: 24,
+    11: 21, 12: 16, 13: 13, 14: 9, 15: 8, 16: 7, 17: 6, 18: 5, 19: 4, 20: 3,
+    21: 2, 22: 2, 23: 1, 24: 1, 25: 1, 26: 1, 27: 1, 28: 1, 29: 1, 30: 1, 
+    31: 1, 32: 1
+}
+GGG_POINTS_FLOOR = 1.0  # Anyone ranked past the table (or unranked) still earns the floor
+
+# Array form of the table: index = weekly rank, slot 0 catches unranked rows
+POINTS_BY_RANK = np.array([GGG_POINTS_FLOOR] + [float(GGG_POINTS.get(r, GGG_POINTS_FLOOR)) for r in range(1, max(GGG_POINTS) + 1)])
+
+# --- HANDICAP RULES ---
+HANDICAP_EVENT_WEEKS = [4, 8]   # GGG Events: no handicap applied, rounds never count
+HANDICAP_PAR = 36
+HANDICAP_CAP = 16.0
+HANDICAP_WINDOW = 4             # Last 4 eligible rounds...
+HANDICAP_BEST_OF = 3            # ...best 3 of them are averaged
+
+# Every week a handicap can be applied to (121/122 are the 12-A / 12-B halves of Week 12)
+HANDICAP_TARGET_WEEKS = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 121, 122, 13, 14]
+
+
+def week_key(weeks):
+    # Chronological sort key: week x 10, with 121 / 122 (12-A / 12-B) slotting in right after Week 12
+    w = pd.to_numeric(pd.Series(weeks), errors='coerce')
+    return w.where(w.isin([121, 122]), w * 10)
+
+
+# --- SCORES SCHEMA ---
+# Compact dtypes enforced once at load time, so views never re-coerce the scores frame
+SCORES_DTYPES = {
+    'Week': 'int16', 'Pars_Count': 'int8', 'Birdies_Count': 'int8', 'Eagle_Count': 'int8',
+    'Total_Score': 'int16', 'Handicap': 'float32', 'Net_Score': 'float32',
+    'DNF': 'bool', 'Acknowledged': 'bool', 'League Fee Paid': 'bool',
+}
+# A round only counts when DNF is explicitly False, so a missing flag reads as DNF
+SCORES_BOOL_DEFAULTS = {'DNF': True, 'Acknowledged': False, 'League Fee Paid': False}
+
+
+def compact_scores(df):
+    # Typed copy of the scores table plus Week_Key; rows without a week can't be placed and are dropped
+    week = pd.to_numeric(df['Week'], errors='coerce')
+    out = df[week.notna()].copy()
+    for col, dtype in SCORES_DTYPES.items():
+        if col not in out.columns:
+            continue
+        if dtype == 'bool':
+            out[col] = out[col].astype(object).where(out[col].notna(), SCORES_BOOL_DEFAULTS[col]).astype(bool)
+        elif dtype.startswith('float'):
+            out[col] = pd.to_numeric(out[col], errors='coerce').astype(dtype)
+        else:
+            out[col] = pd.to_numeric(out[col], errors='coerce').fillna(0).astype(dtype)
+    out['Player'] = out['Player'].astype('category')
+    out['Week_Key'] = week_key(out['Week']).astype('int16')
+    return out.reset_index(drop=True)
+
+
+def clean_scores(data, columns):
+    # The scores table as load_data() serves it: blank / excluded players dropped, then compact_scores
+    if data.empty or 'Player' not in data.columns:
+        return pd.DataFrame(columns=columns)
+    df = data.dropna(how='all')
+    # Filter out specific players
+    df = df[df['Player'].str.lower() != 'john']
+    return compact_scores(df[df['Player'] != ""])
+
+
+def normalize_pin(pin):
+    # PINs can come back as numbers (1234.0) or with stray whitespace
+    return str(pin).split('.')[0].strip()
+
+
+def pin_digest(key, pin):
+    return hmac.new(key, normalize_pin(pin).encode(), hashlib.sha256).hexdigest()
+
+
+def hash_pins(frame, key):
+    # Plaintext PINs never reach the snapshot: registration rows keep a keyed digest, round rows drop theirs
+    if 'PIN' in frame.columns and 'Week' in frame.columns:
+        is_reg = pd.to_numeric(frame['Week'], errors='coerce') == 0
+        frame['PIN'] = [pin_digest(key, p) if reg and pd.notna(p) else None for p, reg in zip(frame['PIN'], is_reg)]
+    return frame
+
+
+def pin_index(df):
+    # Player -> PIN digest from the (first) registration row, rebuilt once per data version
+    if 'PIN' not in df.columns:
+        return {}
+    regs = df[(df['Week'] == 0) & df['PIN'].notna()].drop_duplicates('Player')
+    return dict(zip(regs['Player'].astype(str), regs['PIN']))
+
+
+def eligible_rounds(df, players=None):
+    # Rounds that can count toward a handicap (no GGG Events, no DNFs, a real score), in week order per player
+    if df.empty or 'Total_Score' not in df.columns:
+        return pd.DataFrame(columns=['Player', 'Eff', 'Score'])
+    scores = df['Total_Score']
+    if not pd.api.types.is_numeric_dtype(scores):
+        scores = pd.to_numeric(scores, errors='coerce')
+    keys = df['Week_Key'] if 'Week_Key' in df.columns else week_key(df['Week'])
+    eligible = (
+        (~df['Week'].isin(HANDICAP_EVENT_WEEKS)) &
+        (df['DNF'] == False) &
+        (scores > 0)
+    )
+    if players is not None:
+        eligible &= df['Player'].isin(players)
+    return pd.DataFrame({
+        'Player': df.loc[eligible, 'Player'],
+        'Eff': keys[eligible].to_numpy(dtype=float),
+        'Score': scores[eligible].to_numpy(),
+    }).dropna(subset=['Eff']).sort_values(['Player', 'Eff'], kind='stable')
+
+
+def _handicap_windows(df, targets, players):
+    # Shared by handicap_matrix and handicap_audit. For every player x target week: how many eligible rounds
+    # come before it, and the last HANDICAP_WINDOW of them (newest first) as scores and df row positions.
+    counts = np.zeros((len(players), len(targets)), dtype=np.int64)
+    scores = np.full((len(players), len(targets), HANDICAP_WINDOW), np.nan)
+    rows = np.full((len(players), len(targets), HANDICAP_WINDOW), -1, dtype=np.int64)
+    if df.empty or not players or not targets or 'Total_Score' not in df.columns:
+        return counts, scores, rows
+    rounds = eligible_rounds(df, players)
+    if rounds.empty:
+        return counts, scores, rows
+
+    # Lay each player's eligible rounds out chronologically in one row of a padded grid
+    row = pd.Index(players).get_indexer(rounds['Player'])
+    pos = rounds.groupby('Player', sort=False, observed=True).cumcount().to_numpy()
+    width = int(pos.max()) + 1
+    grid = np.full((len(players), width), np.nan)
+    grid[row, pos] = rounds['Score'].to_numpy()
+    ids = np.full((len(players), width), -1, dtype=np.int64)
+    ids[row, pos] = df.index.get_indexer(rounds.index)
+    effs = np.full((len(players), width), np.inf)
+    effs[row, pos] = rounds['Eff'].to_numpy()
+
+    target_eff = week_key(targets).to_numpy(dtype=float)
+    counts = (effs[:, :, None] < target_eff[None, None, :]).sum(axis=1)
+
+    # The last 4 of those rounds, newest first
+    offsets = counts[:, :, None] - np.arange(1, HANDICAP_WINDOW + 1)
+    take = np.clip(offsets, 0, width - 1)
+    scores = np.take_along_axis(grid[:, None, :], take, axis=2)
+    rows = np.take_along_axis(ids[:, None, :], take, axis=2)
+    scores[offsets < 0] = np.nan
+    rows[offsets < 0] = -1
+    return counts, scores, rows
+
+
+def handicap_matrix(df, target_weeks=None, players=None):
+    # Players x target weeks handicap table, computed for the whole roster in one pass
+    targets = list(HANDICAP_TARGET_WEEKS if target_weeks is None else target_weeks)
+    if players is None:
+        players = sorted(df['Player'].dropna().unique().tolist()) if 'Player' in df.columns else []
+    matrix = pd.DataFrame(0.0, index=pd.Index(players, name='Player'), columns=targets)
+    counts, window, _ = _handicap_windows(df, targets, players)
+
+    # Average the best (lowest) 3 of the window
+    best = np.sort(window, axis=2)[:, :, :HANDICAP_BEST_OF]  # NaN sorts last
+    hcp = np.minimum(np.round(best.sum(axis=2) / HANDICAP_BEST_OF - HANDICAP_PAR, 1), HANDICAP_CAP)
+
+    hcp = np.where(counts >= HANDICAP_BEST_OF, hcp, 0.0)
+    hcp[:, np.isin(targets, HANDICAP_EVENT_WEEKS)] = 0.0
+    matrix.loc[:, :] = hcp
+    return matrix
+
+
+def affected_target_weeks(player_df, week, target_weeks=None):
+    # Target weeks whose best-3-of-last-4 window can include a round played in `week`: every later week
+    # until the player has 4 more eligible rounds after it
+    targets = list(HANDICAP_TARGET_WEEKS if target_weeks is None else target_weeks)
+    changed = float(week_key([week]).iloc[0])
+    later = eligible_rounds(player_df)['Eff'].to_numpy()
+    later = later[later > changed]
+    return [
+        t for t, tk in zip(targets, week_key(targets).to_numpy(dtype=float))
+        if tk > changed and (later < tk).sum() < HANDICAP_WINDOW
+    ]
+
+
+def update_handicap_matrix(matrix, df, changes):
+    # Patch a materialized matrix after rounds change: changes = (player, week) pairs that were written.
+    # Only each player's affected target weeks are recomputed. Returns (matrix, {player: [target weeks]}).
+    weeks_by_player = {}
+    for player, week in changes:
+        weeks_by_player.setdefault(player, set()).add(week)
+
+    out = matrix.copy()
+    updated = {}
+    for player, weeks in weeks_by_player.items():
+        player_df = df[df['Player'] == player]
+        if player not in out.index:
+            out.loc[player] = 0.0
+            targets = list(out.columns)
+        else:
+            affected = set()
+            for week in weeks:
+                affected.update(affected_target_weeks(player_df, week, list(out.columns)))
+            targets = [t for t in out.columns if t in affected]
+        if targets:
+            out.loc[player, targets] = handicap_matrix(player_df, targets, [player]).loc[player].to_numpy()
+        updated[player] = targets
+    return out, updated
+
+
+def handicap_audit(df, target_weeks=None, players=None, matrix=None):
+    # Provenance for every player x target week in one pass: each round played before the target week is
+    # 'used', 'dropped' or 'excluded' with the reason. Eligibility and the window come from the same
+    # _handicap_windows as handicap_matrix; summary Handicap is the matrix itself. Returns (rounds, summary).
+    targets = list(HANDICAP_TARGET_WEEKS if target_weeks is None else target_weeks)
+    if players is None:
+        players = sorted(df['Player'].dropna().unique().tolist()) if 'Player' in df.columns else []
+    if matrix is None:
+        matrix = handicap_matrix(df, targets, players)
+    round_cols = ['Player', 'Target_Week', 'Week', 'Total_Score', 'Status', 'Reason']
+    counts, window, window_rows = _handicap_windows(df, targets, players)
+
+    # Best 3 of each window (lowest scores; the window is newest first, so ties go to the most recent round)
+    order = np.argsort(window, axis=2, kind='stable')[:, :, :HANDICAP_BEST_OF]
+    used_rows = np.take_along_axis(window_rows, order, axis=2)
+    scored = (counts >= HANDICAP_BEST_OF) & ~np.isin(targets, HANDICAP_EVENT_WEEKS)[None, :]
+    used_rows[~scored] = -1
+
+    rounds = pd.DataFrame({
+        'Row': np.arange(len(df)),
+        'Player': df['Player'].astype(object) if 'Player' in df.columns else [],
+        'Week': df['Week'] if 'Week' in df.columns else [],
+        'Key': (df['Week_Key'] if 'Week_Key' in df.columns else week_key(df['Week'])).astype(float).to_numpy() if not df.empty else [],
+        'Total_Score': pd.to_numeric(df['Total_Score'], errors='coerce').to_numpy() if 'Total_Score' in df.columns else [],
+        'DNF': df['DNF'].to_numpy() if 'DNF' in df.columns else [],
+    })
+    rounds = rounds[rounds['Player'].isin(players) & rounds['Key'].notna()]
+    target_df = pd.DataFrame({'Target_Week': targets, 'Target_Key': week_key(targets).to_numpy(dtype=float),
+                              'T': np.arange(len(targets))})
+
+    # Every round against every target week it was played before
+    audit = rounds.merge(target_df, how='cross')
+    audit = audit[audit['Key'] < audit['Target_Key']]
+    p = pd.Index(players).get_indexer(audit['Player'])
+    t = audit['T'].to_numpy()
+    row = audit['Row'].to_numpy()
+
+    # (player, target, row) codes for membership tests against the shared windows
+    def codes(pi, ti, ri):
+        return (pi * len(targets) + ti) * (len(df) + 1) + ri
+    grid_p, grid_t = np.indices(counts.shape)
+    in_window = np.isin(codes(p, t, row), codes(grid_p[..., None], grid_t[..., None], window_rows)[window_rows >= 0])
+    used = np.isin(codes(p, t, row), codes(grid_p[..., None], grid_t[..., None], used_rows)[used_rows >= 0])
+    eligible = np.isin(row, df.index.get_indexer(eligible_rounds(df, players).index))
+    short = counts[p, t] < HANDICAP_BEST_OF if len(audit) else np.zeros(0, dtype=bool)
+    event_target = audit['Target_Week'].isin(HANDICAP_EVENT_WEEKS).to_numpy()
+
+    # Rounds the eligibility rule rejects get the reason; eligible rounds are placed by the window
+    excluded_reason = np.select(
+        [audit['Week'].isin(HANDICAP_EVENT_WEEKS), audit['Week'] == 0, audit['DNF'] != False],
+        ["GGG Event week, never counts", "Registration row, not a round", "DNF"],
+        default="No score recorded",
+    )
+    status = np.select([~eligible, used], ["excluded", "used"], default="dropped")
+    reason = np.select(
+        [~eligible, used, event_target, short, in_window],
+        [excluded_reason,
+         f"Best {HANDICAP_BEST_OF} of the last {HANDICAP_WINDOW}",
+         "Target week is a GGG Event, no handicap applied",
+         f"Fewer than {HANDICAP_BEST_OF} eligible rounds, handicap defaults to 0.0",
+         f"Highest score of the last {HANDICAP_WINDOW}"],
+        default=f"Older than the last {HANDICAP_WINDOW} eligible rounds",
+    )
+
+    audit = audit.assign(Status=status, Reason=reason)
+    audit = audit.sort_values(['Player', 'Target_Key', 'Key'], ascending=[True, True, False], kind='stable')
+    audit_rounds = audit[round_cols].reset_index(drop=True)
+
+    # One summary row per player x target week
+    summary = matrix.stack().rename('Handicap').reset_index()
+    summary.columns = ['Player', 'Target_Week', 'Handicap']
+    eligible_counts = pd.DataFrame(counts, index=pd.Index(players), columns=targets).stack().rename('Eligible_Rounds').reset_index()
+    eligible_counts.columns = ['Player', 'Target_Week', 'Eligible_Rounds']
+    summary = summary.merge(eligible_counts, on=['Player', 'Target_Week'], how='left')
+    summary['Eligible_Rounds'] = summary['Eligible_Rounds'].fillna(0).astype(int)
+    summary['Method'] = np.select(
+        [summary['Target_Week'].isin(HANDICAP_EVENT_WEEKS),
+         summary['Eligible_Rounds'] < HANDICAP_BEST_OF,
+         summary['Handicap'] >= HANDICAP_CAP],
+        ["GGG Event week: no handicap applied",
+         f"Insufficient rounds (fewer than {HANDICAP_BEST_OF}), defaults to 0.0",
+         f"Best {HANDICAP_BEST_OF} of last {HANDICAP_WINDOW} eligible rounds (capped at {HANDICAP_CAP})"],
+        default=f"Best {HANDICAP_BEST_OF} of last {HANDICAP_WINDOW} eligible rounds, average gross - {HANDICAP_PAR}",
+    )
+    return audit_rounds, summary
+
+
+def lookup_handicap(matrix, player, target_week):
+    if target_week in HANDICAP_EVENT_WEEKS:
+        return 0.0
+    try:
+        return float(matrix.at[player, target_week])
+    except KeyError:
+        return 0.0
+
+
+def calculate_rolling_handicap(player_df, target_week, matrix=None):
+    # Deprecated single-player entry point, kept for ad hoc checks. With the season matrix it is a cell lookup;
+    # without one it builds a one-player matrix per call (~7 ms), so loops over the roster must pass it or
+    # use handicap_matrix + lookup_handicap directly. The app never calls it.
+    if matrix is not None:
+        player = player_df['Player'].iloc[0] if len(player_df) else None
+        return lookup_handicap(matrix, player, target_week)
+    warnings.warn(
+        "calculate_rolling_handicap builds a matrix per call; use handicap_matrix() and lookup_handicap()",
+        DeprecationWarning, stacklevel=2,
+    )
+    try:
+        if target_week in HANDICAP_EVENT_WEEKS:
+            return 0.0
+        single = handicap_matrix(player_df, [target_week])
+        return float(single.iloc[0, 0]) if not single.empty else 0.0
+    except Exception:
+        return 0.0
+
+
+def format_handicap(hcp):
+    # Traditional golf styling: a negative (better than par) handicap shows as "+"
+    return f"+{abs(hcp)}" if hcp < 0 else f"{hcp}"
+
+
+# --- STANDINGS ---
+
+def weekly_points(df):
+    # Every completed round ranked within its week (ties share the better rank) and scored off the points table
+    if df.empty:
+        return pd.DataFrame(columns=list(df.columns) + ['Rank', 'Points'])
+    rounds = df[(df['Week'] > 0) & (df['DNF'] == False)].copy()
+    rounds['Rank'] = rounds.groupby('Week', observed=True)['Net_Score'].rank(method='min')
+    ranks = rounds['Rank'].fillna(0).to_numpy(dtype=np.int64)
+    rounds['Points'] = np.where(ranks < len(POINTS_BY_RANK), POINTS_BY_RANK[np.clip(ranks, 0, len(POINTS_BY_RANK) - 1)], GGG_POINTS_FLOOR)
+    return rounds
+
+
+def season_standings(points_df):
+    # Aggregate only the total points per player
+    if points_df.empty:
+        return pd.DataFrame(columns=['Player', 'Total Pts'])
+    res = points_df.groupby('Player', observed=True).agg({'Points': 'sum'}).reset_index().rename(columns={'Points': 'Total Pts'})
+    return res.sort_values('Total Pts', ascending=False)
+
+
+# --- SEASON DASHBOARD ---
+DASHBOARD_EMPTY = {"Avg_Net": None, "Pars": 0, "Birdies": 0, "Eagles": 0, "Rounds": 0}
+
+
+def player_dashboards(df):
+    # Scorecard "Season Dashboard" for the whole roster in one grouped pass: player -> {"metrics", "series"},
+    # where series holds the player's completed rounds (Week label, Net_Score) as lists in season order, ready to chart
+    if df.empty:
+        return {}
+    played = df[(df['Week'] > 0) & (df['DNF'] == False)]
+    players = played['Player'].astype(str).to_numpy()
+    order = np.lexsort((played['Week_Key'].to_numpy(), players))
+    players = players[order]
+    labels = week_labels(played['Week']).to_numpy()[order]
+    nets = played['Net_Score'].to_numpy(dtype=float)[order]
+    stats = {
+        col: played[col].to_numpy(dtype=np.int64)[order]
+        for col in ('Pars_Count', 'Birdies_Count', 'Eagle_Count')
+    }
+
+    dashboards = {
+        str(player): {"metrics": DASHBOARD_EMPTY, "series": {'Week': [], 'Net_Score': []}}
+        for player in df['Player'].dropna().unique()
+    }
+    # Rows are grouped by player after the sort: slice each player's block once
+    names, starts, counts = np.unique(players, return_index=True, return_counts=True)
+    pars, birdies, eagles = (np.add.reduceat(stats[c], starts) if len(starts) else [] for c in ('Pars_Count', 'Birdies_Count', 'Eagle_Count'))
+    net_sums = np.add.reduceat(nets, starts) if len(starts) else []
+    for i, (player, start, n) in enumerate(zip(names, starts, counts)):
+        dashboards[player] = {
+            "metrics": {"Avg_Net": float(net_sums[i] / n), "Pars": int(pars[i]), "Birdies": int(birdies[i]),
+                        "Eagles": int(eagles[i]), "Rounds": int(n)},
+            "series": {'Week': labels[start:start + n].tolist(), 'Net_Score': nets[start:start + n].tolist()},
+        }
+    return dashboards
+
+
+# --- HISTORY ---
+HISTORY_PAGE_SIZE = 50
+HISTORY_COLUMNS = ['Week_Label', 'Player', 'Total_Score', 'Handicap', 'Net_Score', 'Points']
+
+
+def history_index(points_df):
+    # History tab rows (newest week first, most points first within a week) plus the row positions for each
+    # Week and each Player, so a filtered page is a lookup and a slice instead of a scan over every round
+    if points_df.empty:
+        return {"rows": pd.DataFrame(columns=HISTORY_COLUMNS), "weeks": [], "players": [], "by_week": {}, "by_player": {}}
+    rows = points_df.sort_values(['Week_Key', 'Points'], ascending=[False, False], kind='stable').reset_index(drop=True)
+    rows['Week_Label'] = week_labels(rows['Week'], prefix="Wk ")
+    weeks = rows.drop_duplicates('Week').sort_values('Week_Key')['Week']
+    return {
+        "rows": rows[HISTORY_COLUMNS],
+        "weeks": [int(w) for w in weeks],
+        "players": sorted(rows['Player'].astype(str).unique().tolist()),
+        "by_week": {int(w): pos for w, pos in rows.groupby('Week', observed=True).indices.items()},
+        "by_player": {str(p): pos for p, pos in rows.groupby('Player', observed=True).indices.items()},
+    }
+
+
+def history_positions(index, player=None, week=None):
+    # Row positions matching the filters, in display order
+    empty = np.empty(0, dtype=np.int64)
+    if week is None and player is None:
+        return np.arange(len(index["rows"]))
+    if player is None:
+        return index["by_week"].get(week, empty)
+    if week is None:
+        return index["by_player"].get(player, empty)
+    return np.intersect1d(index["by_week"].get(week, empty), index["by_player"].get(player, empty), assume_unique=True)
+
+
+def history_page(index, positions, page=1, size=HISTORY_PAGE_SIZE):
+    return index["rows"].iloc[positions[(page - 1) * size:page * size]]
+
+
+# --- LIVE SCORECARD ---
+LIVE_HOLES = list(range(1, 19))
+FRONT_NINE = list(range(1, 10))
+BACK_NINE = list(range(10, 19))
+LIVE_COLUMNS = LIVE_HOLES + ["Front 9", "Back 9", "Total"]
+
+
+def _total_live_rows(scorecard, rows=None):
+    # Recalculate Front 9, Back 9 and Total (for every player, or only the rows that changed)
+    rows = scorecard.index if rows is None else rows
+    scorecard.loc[rows, "Front 9"] = scorecard.loc[rows, FRONT_NINE].sum(axis=1)
+    scorecard.loc[rows, "Back 9"] = scorecard.loc[rows, BACK_NINE].sum(axis=1)
+    scorecard.loc[rows, "Total"] = scorecard.loc[rows, "Front 9"] + scorecard.loc[rows, "Back 9"]
+    return scorecard
+
+
+def build_live_scorecard(df_live):
+    # Player x hole scorecard from live_scores rows (0 = hole not played yet)
+    if df_live.empty:
+        return pd.DataFrame(columns=LIVE_COLUMNS, dtype=int)
+    rows = df_live.drop_duplicates(subset=["player_name", "hole_number"], keep="last")
+    scorecard = rows.pivot(index="player_name", columns="hole_number", values="score")
+    scorecard.columns = pd.to_numeric(scorecard.columns, errors="coerce")
+    scorecard = scorecard.reindex(columns=LIVE_HOLES)
+    scorecard = scorecard.apply(pd.to_numeric, errors="coerce").fillna(0).astype(int)
+    scorecard = scorecard.reindex(columns=LIVE_COLUMNS, fill_value=0)
+    return _total_live_rows(scorecard)
+
+
+def patch_live_scorecard(scorecard, delta):
+    # Apply only the changed hole scores to an existing scorecard; only touched players get re-totaled
+    if delta.empty:
+        return scorecard
+    if scorecard.empty:
+        return build_live_scorecard(delta)
+    delta = delta.drop_duplicates(subset=["player_name", "hole_number"], keep="last")
+    holes = pd.to_numeric(delta["hole_number"], errors="coerce")
+    delta = delta[holes.isin(LIVE_HOLES)]
+    holes = holes[holes.isin(LIVE_HOLES)].astype(int)
+
+    card = scorecard.copy()
+    new_players = [p for p in delta["player_name"].unique() if p not in card.index]
+    if new_players:
+        card = pd.concat([card, pd.DataFrame(0, index=new_players, columns=card.columns)])
+        card.index.name = scorecard.index.name
+
+    values = card.to_numpy(copy=True)
+    values[card.index.get_indexer(delta["player_name"]), card.columns.get_indexer(holes)] = \
+        pd.to_numeric(delta["score"], errors="coerce").fillna(0).astype(int).to_numpy()
+    card = pd.DataFrame(values, index=card.index, columns=card.columns)
+    return _total_live_rows(card, card.index.isin(delta["player_name"]))
+
+
+def live_podium(scorecard, places=3):
+    # Lowest totals first, ignoring players who haven't posted a hole yet
+    if scorecard.empty:
+        return scorecard
+    return scorecard[scorecard["Total"] > 0].sort_values(by="Total", ascending=True).head(places)
+
+
+# --- SEASON CALENDAR ---
+LEAGUE_TZ = ZoneInfo('America/Chicago')
+LEAGUE_START = datetime.datetime(2026, 5, 31, tzinfo=LEAGUE_TZ)  # Week 1 Sunday
+SCORE_WINDOW_OPENS = datetime.time(14, 0)   # Scores open Sunday 2:00 PM...
+SCORE_WINDOW_CLOSES = datetime.time(12, 0)  # ...and close Monday 12:00 PM (Central)
+
+REGULAR_ROUND = "Regular Round"
+DOUBLE_POINTS = "GGG Event- Double Points (18 holes)"
+
+# Published schedule: week code -> (course, format). 121 / 122 are the 12-A / 12-B halves of Week 12;
+# Week 14 is a scoring week with no course published yet, so it stays off the Schedule view.
+SEASON_SCHEDULE = {
+    1: ("Dretzka", REGULAR_ROUND),
+    2: ("Currie", REGULAR_ROUND),
+    3: ("Whitnall", REGULAR_ROUND),
+    4: ("Brown Deer", "GGG Event- 2 Man Team Greensome (18 holes)"),
+    5: ("Oakwood", REGULAR_ROUND),
+    6: ("Dretzka", REGULAR_ROUND),
+    7: ("Currie", REGULAR_ROUND),
+    8: ("Brown Deer", "GGG Event- 4 Man Team Scramble (18 holes)"),
+    9: ("Whitnall", REGULAR_ROUND),
+    10: ("Oakwood", REGULAR_ROUND),
+    11: ("Dretzka", REGULAR_ROUND),
+    12: ("Brown Deer", DOUBLE_POINTS),
+    121: ("Brown Deer", DOUBLE_POINTS),
+    122: ("Brown Deer", DOUBLE_POINTS),
+    13: ("Grant", REGULAR_ROUND),
+    14: (None, REGULAR_ROUND),
+}
+SEASON_FINALE = {
+    "date": datetime.date(2026, 8, 28), "course": "TBD",
+    "format": "GGG Event- GGGolf Finale & Friends & Family Picnic",
+}
+
+
+WEEK_LABELS = {121: "12-A", 122: "12-B"}
+
+
+def week_label(week):
+    return WEEK_LABELS.get(week, str(week))
+
+
+def week_labels(weeks, prefix=""):
+    # week_label for a whole column: 121 / 122 map to 12-A / 12-B, every other week is prefix + number
+    weeks = pd.Series(weeks).astype(np.int64)
+    return weeks.map(WEEK_LABELS).fillna(prefix + weeks.astype(str))
+
+
+class SeasonCalendar:
+    # Every week code of the season with its play date, score entry window, course, format and event flags,
+    # built once at import. Lookups are dict hits and current_week is a bisect over the play dates.
+    def __init__(self, start=LEAGUE_START, schedule=SEASON_SCHEDULE, finale=SEASON_FINALE):
+        self.start = start
+        self.finale = finale
+        rows = []
+        for week, (course, fmt) in schedule.items():
+            base = 12 if week in (121, 122) else week
+            play_date = start + datetime.timedelta(weeks=base - 1)
+            opens = datetime.datetime.combine(play_date.date(), SCORE_WINDOW_OPENS, tzinfo=start.tzinfo)
+            closes = datetime.datetime.combine(play_date.date() + datetime.timedelta(days=1), SCORE_WINDOW_CLOSES, tzinfo=start.tzinfo)
+            label = week_label(week)
+            rows.append({
+                "Week": week, "Base_Week": base, "Week_Key": int(week_key([week]).iloc[0]), "Label": label,
+                "Play_Date": play_date, "Window_Start": opens, "Window_End": closes,
+                "Course": course, "Format": fmt,
+                "Event": fmt.startswith("GGG Event"),
+                "Handicap_Applied": base not in HANDICAP_EVENT_WEEKS,
+                "Opens_Msg": f"Score entry for Week {label} opens on {opens.strftime('%A, %b %d at %I:%M %p')}.",
+                "Closed_Msg": f"Score entry for Week {label} closed on {closes.strftime('%A, %b %d at %I:%M %p')}.",
+            })
+        self.table = pd.DataFrame(rows).sort_values("Week_Key").set_index("Week", drop=False)
+        self.weeks = {row["Week"]: row for row in rows}
+
+        # One entry per Sunday (12-A / 12-B share Week 12's)
+        self.base_weeks = sorted(set(self.table["Base_Week"]))
+        self._play_dates = [self.weeks[w]["Play_Date"] for w in self.base_weeks]
+        self.event_weeks = [w for w in self.base_weeks if self.weeks[w]["Event"]]
+        self.pairing_weeks = [w for w in self.base_weeks if not self.weeks[w]["Event"]]
+        self.no_handicap_weeks = [w for w in self.base_weeks if not self.weeks[w]["Handicap_Applied"]]
+
+    def week(self, week):
+        return self.weeks.get(week)
+
+    def label(self, week):
+        return week_label(week)
+
+    def is_event(self, week):
+        row = self.weeks.get(week)
+        return bool(row and row["Event"])
+
+    def handicap_applied(self, week):
+        row = self.weeks.get(week)
+        return row is None or row["Handicap_Applied"]
+
+    def window_status(self, week, now=None):
+        # (is_open, message) for score entry; pre-season rounds (week <= 0) are always open
+        if week <= 0:
+            return True, ""
+        row = self.weeks.get(week)
+        if row is None:
+            return False, f"Week {week_label(week)} is not on the season calendar."
+        now = now or datetime.datetime.now(LEAGUE_TZ)
+        if now < row["Window_Start"]:
+            return False, row["Opens_Msg"]
+        if now > row["Window_End"]:
+            return False, row["Closed_Msg"]
+        return True, ""
+
+    def current_week(self, now=None):
+        # Season week whose Sunday has most recently arrived (Week 1 before the season, the last week after it)
+        now = now or datetime.datetime.now(LEAGUE_TZ)
+        played = bisect.bisect_right(self._play_dates, now)
+        return self.base_weeks[min(max(played, 1), len(self.base_weeks)) - 1]
+
+    def next_week(self, after=None, skip_events=False):
+        # First Sunday after the given week code (12-A / 12-B count as Week 12); the last week once the season is done.
+        # skip_events passes over GGG Event Sundays (4, 8, 12) like the Handicaps tab's default always has
+        after_base = 0 if after is None else self.weeks.get(after, {"Base_Week": after})["Base_Week"]
+        for week in self.base_weeks:
+            if week > after_base and not (skip_events and self.weeks[week]["Event"]):
+                return week
+        return self.base_weeks[-1]
+
+    def schedule(self):
+        # Published schedule rows, one per Sunday with a course
+        return [row for week, row in self.weeks.items() if week == row["Base_Week"] and row["Course"]]
+
+
+SEASON_CALENDAR = SeasonCalendar()
+
+
+def get_score_window_status(week_num, now=None):
+    return SEASON_CALENDAR.window_status(week_num, now)
+
+
+# --- LIVE ROUNDS ---
+# One live round per Sunday of the season, keyed by its week number
+def current_week(now=None):
+    return SEASON_CALENDAR.current_week(now)
+
+
+# --- WEEKLY PAIRINGS ---
+PAIRING_GROUP_SIZE = 4
+PAIRING_REPEAT_PENALTY = 100.0     # One repeat pairing outweighs any handicap imbalance
+PAIRING_SWAPS_PER_PLAYER = 150     # Local search budget: random cross-group swaps tried per player
+
+
+def pairing_players(players):
+    # weekly_pairings stores each group as a comma-separated "players" string
+    return [p.strip() for p in str(players).split(",") if p.strip()]
+
+
+def pairing_history(pairings, roster):
+    # roster x roster count of how many times two players have already shared a group
+    index = {p: i for i, p in enumerate(roster)}
+    counts = np.zeros((len(roster), len(roster)), dtype=np.int32)
+    for players in (pairings['players'] if 'players' in pairings else []):
+        ids = [index[p] for p in pairing_players(players) if p in index]
+        counts[np.ix_(ids, ids)] += 1
+    np.fill_diagonal(counts, 0)
+    return counts
+
+
+def pairing_group_sizes(n, size=PAIRING_GROUP_SIZE):
+    # Foursomes where the roster divides evenly, otherwise groups as even as possible (e.g. 10 -> 4, 3, 3)
+    groups = max(1, -(-n // size))
+    return [n // groups + (1 if g < n % groups else 0) for g in range(groups)]
+
+
+def optimize_pairings(roster, history=None, handicaps=None, size=PAIRING_GROUP_SIZE, seed=0):
+    # Splits the roster into groups minimizing repeat pairings against history (a pairing_history matrix).
+    # Passing handicaps (player -> handicap) also evens out each group's average. Returns (groups, repeats).
+    roster = list(roster)
+    n = len(roster)
+    if n == 0:
+        return [], 0
+    rng = np.random.default_rng(seed)
+    # Sparse view of the history: only pairs that have already met
+    seen = [{} for _ in range(n)]
+    if history is not None:
+        for a, b in zip(*np.nonzero(history)):
+            seen[a][b] = int(history[a, b])
+    hcp = None if handicaps is None else [float(handicaps.get(p, 0.0)) for p in roster]
+    sizes = pairing_group_sizes(n, size)
+
+    # Starting point: snake draft by handicap when balancing, otherwise a shuffle
+    order = sorted(range(n), key=lambda i: hcp[i]) if hcp is not None else rng.permutation(n).tolist()
+    snake = [g for r in range(max(sizes)) for g in (range(len(sizes)) if r % 2 == 0 else reversed(range(len(sizes)))) if sizes[g] > r]
+    groups = [[] for _ in sizes]
+    group_of = [0] * n
+    for player, g in zip(order, snake):
+        groups[g].append(player)
+        group_of[player] = g
+    target = sum(hcp) / n if hcp is not None else 0.0
+    sums = [sum(hcp[p] for p in grp) for grp in groups] if hcp is not None else None
+
+    def met(p, grp, skip):
+        row = seen[p]
+        return sum(row.get(m, 0) for m in grp if m != skip)
+
+    # Hill climb over random cross-group swaps; equal-cost swaps are taken to drift across plateaus
+    swaps = rng.integers(0, n, size=(PAIRING_SWAPS_PER_PLAYER * n, 2)).tolist()
+    for a, b in swaps:
+        ga, gb = group_of[a], group_of[b]
+        if ga == gb:
+            continue
+        delta = PAIRING_REPEAT_PENALTY * (
+            met(a, groups[gb], b) + met(b, groups[ga], a) - met(a, groups[ga], a) - met(b, groups[gb], b)
+        )
+        if sums is not None:
+            d = hcp[b] - hcp[a]
+            la, lb = len(groups[ga]), len(groups[gb])
+            delta += ((sums[ga] + d) / la - target) ** 2 + ((sums[gb] - d) / lb - target) ** 2 \
+                - (sums[ga] / la - target) ** 2 - (sums[gb] / lb - target) ** 2
+        if delta <= 0:
+            groups[ga][groups[ga].index(a)] = b
+            groups[gb][groups[gb].index(b)] = a
+            group_of[a], group_of[b] = gb, ga
+            if sums is not None:
+                sums[ga] += d
+                sums[gb] -= d
+
+    repeats = sum(seen[a].get(b, 0) for grp in groups for i, a in enumerate(grp) for b in grp[i + 1:])
+    return [sorted(roster[p] for p in grp) for grp in groups], repeats
+
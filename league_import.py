@@ -0,0 +1,230 @@
+# --------------------------------------------------------------- GGG GOLF BULK IMPORT ---------------------------------------------------------------
+# Validates Admin CSV uploads (rounds, registrations, pairings) against the scores columns and the season calendar.
+# Each validator returns (rows, errors): rows shaped exactly like the app's own single-row writes, ready for a
+# batched upsert, and one error dict per rejected CSV line. Nothing in here talks to Streamlit or Supabase.
+import pandas as pd
+
+from league_engine import SEASON_CALENDAR, lookup_handicap, pairing_players
+
+IMPORT_BATCH_SIZE = 500            # Rows per upsert request; a whole week fits in one
+IMPORT_PRE_SEASON_WEEKS = [-2, -1]
+IMPORT_SCORE_RANGE = (25, 119)     # Same gross options as the scorecard
+
+# Columns per import kind; Rounds and Registrations must come from MASTER_COLUMNS
+IMPORT_KINDS = {
+    "Rounds": {
+        "required": ["Week", "Player", "Total_Score"],
+        "optional": ["Pars_Count", "Birdies_Count", "Eagle_Count", "Handicap", "DNF"],
+    },
+    "Registrations": {"required": ["Player", "PIN"], "optional": []},
+    "Pairings": {"required": ["week", "group_id", "players"], "optional": []},
+}
+
+_TRUE = {"true", "t", "yes", "y", "1", "x", "dnf"}
+_FALSE = {"false", "f", "no", "n", "0", ""}
+
+
+def read_import_csv(source):
+    # Everything as text so validation sees exactly what was typed
+    frame = pd.read_csv(source, dtype=str, keep_default_na=False, skipinitialspace=True)
+    frame.columns = [str(c).strip() for c in frame.columns]
+    return frame
+
+
+def import_template(kind):
+    spec = IMPORT_KINDS[kind]
+    return ",".join(spec["required"] + spec["optional"]) + "\n"
+
+
+def check_import_columns(frame, kind, columns=None):
+    # File-level problems (missing / unknown columns) reject the whole upload
+    spec = IMPORT_KINDS[kind]
+    allowed = spec["required"] + spec["optional"]
+    errors = []
+    missing = [c for c in spec["required"] if c not in frame.columns]
+    if missing:
+        errors.append({"Row": "-", "Record": kind, "Error": f"Missing column(s): {', '.join(missing)}"})
+    unknown = [c for c in frame.columns if c not in allowed]
+    if unknown:
+        errors.append({"Row": "-", "Record": kind, "Error": f"Unknown column(s): {', '.join(unknown)}. Expected: {', '.join(allowed)}"})
+    if columns is not None and kind != "Pairings":
+        outside = [c for c in allowed if c not in columns]
+        if outside:
+            errors.append({"Row": "-", "Record": kind, "Error": f"Not in the scores schema: {', '.join(outside)}"})
+    return errors
+
+
+def _records(frame):
+    # (CSV line number, row dict); line 1 is the header
+    for i, rec in enumerate(frame.to_dict("records")):
+        yield i + 2, {k: str(v).strip() for k, v in rec.items()}
+
+
+def _int(text):
+    try:
+        value = float(text)
+    except ValueError:
+        return None
+    return int(value) if value.is_integer() else None
+
+
+def _float(text):
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def parse_import_week(text):
+    text = text.upper().replace("WEEK", "").replace("WK", "").strip()
+    return {"12-A": 121, "12A": 121, "12-B": 122, "12B": 122}.get(text, _int(text))
+
+
+def validate_rounds(frame, registered, matrix, columns=None):
+    errors = check_import_columns(frame, "Rounds", columns)
+    if errors:
+        return [], errors
+    registered = set(registered)
+    rows, seen = [], set()
+    for line, rec in _records(frame):
+        player = rec["Player"]
+        week = parse_import_week(rec["Week"])
+        problems = []
+
+        if player not in registered:
+            problems.append(f"{player or 'Blank player'} is not registered")
+        if week is None:
+            problems.append(f"Week {rec['Week']!r} must be a number, 12-A or 12-B")
+        elif week == 0:
+            problems.append("Week 0 is the registration row, use the Registrations import")
+        elif week == 12:
+            problems.append("Week 12 is scored as 12-A and 12-B")
+        elif week not in IMPORT_PRE_SEASON_WEEKS and SEASON_CALENDAR.week(week) is None:
+            problems.append(f"Week {week} is not on the season calendar")
+        elif (week, player) in seen:
+            problems.append("Duplicate of an earlier row in this file")
+
+        dnf_text = rec.get("DNF", "").lower()
+        is_dnf = rec["Total_Score"].upper() == "DNF" or dnf_text in _TRUE
+        if dnf_text not in _TRUE | _FALSE:
+            problems.append(f"DNF {rec['DNF']!r} must be true or false")
+        gross = 0 if is_dnf else _int(rec["Total_Score"])
+        if not is_dnf and (gross is None or not IMPORT_SCORE_RANGE[0] <= gross <= IMPORT_SCORE_RANGE[1]):
+            problems.append(f"Total_Score {rec['Total_Score']!r} must be DNF or {IMPORT_SCORE_RANGE[0]}-{IMPORT_SCORE_RANGE[1]}")
+
+        counts = {}
+        for col in ("Pars_Count", "Birdies_Count", "Eagle_Count"):
+            value = _int(rec.get(col) or "0")
+            if value is None or not 0 <= value <= 18:
+                problems.append(f"{col} {rec[col]!r} must be 0-18")
+            counts[col] = value
+
+        hcp = None
+        if rec.get("Handicap"):
+            hcp = _float(rec["Handicap"])
+            if hcp is None:
+                problems.append(f"Handicap {rec['Handicap']!r} must be a number")
+
+        if problems:
+            errors.append({"Row": line, "Record": f"Week {rec['Week']} / {player}", "Error": "; ".join(problems)})
+            continue
+
+        seen.add((week, player))
+        # No handicap given: the one the scorecard would apply for that week
+        if hcp is None:
+            hcp = 0.0 if week <= 0 or not SEASON_CALENDAR.handicap_applied(week) else lookup_handicap(matrix, player, week)
+        rows.append({
+            'Week': week,
+            'Player': player,
+            'Pars_Count': counts['Pars_Count'],
+            'Birdies_Count': counts['Birdies_Count'],
+            'Eagle_Count': counts['Eagle_Count'],
+            'Total_Score': gross,
+            'Handicap': float(hcp),
+            'Net_Score': float(gross - hcp) if not is_dnf else 0.0,
+            'DNF': is_dnf
+        })
+    return rows, errors
+
+
+def validate_registrations(frame, registered, columns=None):
+    errors = check_import_columns(frame, "Registrations", columns)
+    if errors:
+        return [], errors
+    registered = set(registered)
+    rows, seen = [], set()
+    for line, rec in _records(frame):
+        player, pin = rec["Player"], rec["PIN"]
+        problems = []
+        if not player:
+            problems.append("Player name is blank")
+        elif player in registered:
+            problems.append(f"{player} is already registered")
+        elif player in seen:
+            problems.append("Duplicate of an earlier row in this file")
+        if not (len(pin) == 4 and pin.isdigit()):
+            problems.append("PIN must be 4 digits")
+
+        if problems:
+            errors.append({"Row": line, "Record": player or "-", "Error": "; ".join(problems)})
+            continue
+        seen.add(player)
+        rows.append({
+            "Week": 0, "Player": player, "PIN": pin, "Handicap": 0.0, "DNF": True,
+            "Pars_Count": 0, "Birdies_Count": 0, "Eagle_Count": 0,
+            "Total_Score": 0, "Net_Score": 0.0, "Acknowledged": True
+        })
+    return rows, errors
+
+
+def validate_pairings(frame, registered, published=None):
+    # published: weekly_pairings rows already live for the uploaded weeks (leave out weeks being replaced);
+    # uploaded groups can't reuse their group numbers or players, so a re-upload never doubles a week
+    errors = check_import_columns(frame, "Pairings")
+    if errors:
+        return [], errors
+    registered = set(registered)
+    rows, groups, placed = [], set(), {}
+    live_groups, live_placed = set(), {}
+    for rec in published or []:
+        week, group = _int(str(rec.get("week"))), _int(str(rec.get("group_id")))
+        live_groups.add((week, group))
+        live_placed.update({(week, p): group for p in pairing_players(rec.get("players", ""))})
+    for line, rec in _records(frame):
+        week, group = _int(rec["week"]), _int(rec["group_id"])
+        players = pairing_players(rec["players"])
+        problems = []
+        if week is None or SEASON_CALENDAR.week(week) is None:
+            problems.append(f"Week {rec['week']!r} is not on the season calendar")
+        elif SEASON_CALENDAR.is_event(week):
+            problems.append(f"Week {week} is a GGG Event, pairings are not required")
+        if group is None or group < 1:
+            problems.append(f"group_id {rec['group_id']!r} must be 1 or more")
+        elif (week, group) in groups:
+            problems.append(f"Group {group} appears twice for Week {week}")
+        elif (week, group) in live_groups:
+            problems.append(f"Group {group} is already published for Week {week}")
+        if not players:
+            problems.append("No players listed")
+        unknown = [p for p in players if p not in registered]
+        if unknown:
+            problems.append(f"Not registered: {', '.join(unknown)}")
+        doubled = [p for p in players if (week, p) in placed or players.count(p) > 1]
+        if doubled:
+            problems.append(f"Already in another group this week: {', '.join(sorted(set(doubled)))}")
+        live = [p for p in players if (week, p) in live_placed]
+        if live:
+            problems.append(f"Already in a published group this week: {', '.join(sorted(set(live)))}")
+
+        if problems:
+            errors.append({"Row": line, "Record": f"Week {rec['week']} / Group {rec['group_id']}", "Error": "; ".join(problems)})
+            continue
+        groups.add((week, group))
+        placed.update({(week, p): group for p in players})
+        rows.append({"week": week, "group_id": group, "players": ", ".join(players)})
+    return rows, errors
+
+
+def import_batches(rows, size=IMPORT_BATCH_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
@@ -0,0 +1,110 @@
+# --------------------------------------------------------------- GGG GOLF RERUN PROFILER ---------------------------------------------------------------
+# Timing spans for each Streamlit rerun (tab bodies, load_data, handicaps, image loads) plus per-query stats
+# for every repository call. One profiler per server process; each session's script thread records its own
+# rerun. When disabled, span() hands back a shared no-op context and queries are not hooked at all.
+import contextlib
+import json
+import threading
+import time
+from collections import deque
+
+PROFILE_HISTORY = 25   # Reruns kept for the Admin panel
+
+_NO_SPAN = contextlib.nullcontext()
+
+
+class RerunProfiler:
+    def __init__(self, history=PROFILE_HISTORY):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.reruns = deque(maxlen=history)
+        self.queries = {}
+        self._local = threading.local()
+
+    # --- RERUNS ---
+
+    def begin(self, label):
+        if not self.enabled:
+            return
+        # st.rerun()/st.stop() skip the end of the script, so close out any rerun this thread left open
+        self.end()
+        self._local.run = {"label": label, "started": time.time(), "t0": time.perf_counter(),
+                           "spans": [], "queries": 0, "depth": 0}
+
+    def end(self):
+        run = getattr(self._local, "run", None)
+        if run is None:
+            return
+        self._local.run = None
+        run["total_ms"] = (time.perf_counter() - run.pop("t0")) * 1000
+        run.pop("depth")
+        with self.lock:
+            self.reruns.append(run)
+
+    @contextlib.contextmanager
+    def _span(self, run, name):
+        start = time.perf_counter()
+        run["depth"] += 1
+        try:
+            yield
+        finally:
+            run["depth"] -= 1
+            run["spans"].append({"name": name, "ms": (time.perf_counter() - start) * 1000, "depth": run["depth"]})
+
+    def span(self, name):
+        run = getattr(self._local, "run", None) if self.enabled else None
+        return _NO_SPAN if run is None else self._span(run, name)
+
+    # --- QUERIES ---
+
+    def record_query(self, table, op, data, ms):
+        payload = len(json.dumps(data, default=str).encode()) if data else 0
+        rows = len(data) if isinstance(data, list) else 0
+        with self.lock:
+            stats = self.queries.setdefault((table, op), {"calls": 0, "rows": 0, "bytes": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stats["calls"] += 1
+            stats["rows"] += rows
+            stats["bytes"] += payload
+            stats["total_ms"] += ms
+            stats["max_ms"] = max(stats["max_ms"], ms)
+        run = getattr(self._local, "run", None)
+        if run is not None:
+            run["queries"] += 1
+            run["spans"].append({"name": f"query {op} {table} ({rows} rows, {payload / 1024:.1f} KB)",
+                                 "ms": ms, "depth": run["depth"]})
+
+    def reset(self):
+        with self.lock:
+            self.reruns.clear()
+            self.queries.clear()
+
+    # --- REPORTS ---
+
+    def recent_reruns(self):
+        with self.lock:
+            runs = list(self.reruns)
+        return [
+            {"Started": time.strftime("%H:%M:%S", time.localtime(r["started"])), "Rerun": r["label"],
+             "Total ms": round(r["total_ms"], 1), "Spans": len(r["spans"]), "Queries": r["queries"]}
+            for r in reversed(runs)
+        ]
+
+    def slowest_spans(self, limit=15):
+        with self.lock:
+            runs = list(self.reruns)
+        spans = [
+            {"Span": s["name"], "ms": round(s["ms"], 1), "Rerun": r["label"],
+             "Started": time.strftime("%H:%M:%S", time.localtime(r["started"]))}
+            for r in runs for s in r["spans"]
+        ]
+        return sorted(spans, key=lambda s: s["ms"], reverse=True)[:limit]
+
+    def query_stats(self):
+        with self.lock:
+            items = list(self.queries.items())
+        return [
+            {"Table": table, "Op": op, "Calls": s["calls"], "Rows": s["rows"], "KB": round(s["bytes"] / 1024, 1),
+             "Total ms": round(s["total_ms"], 1), "Avg ms": round(s["total_ms"] / s["calls"], 1),
+             "Max ms": round(s["max_ms"], 1)}
+            for (table, op), s in sorted(items, key=lambda kv: kv[1]["total_ms"], reverse=True)
+        ]
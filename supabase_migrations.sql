@@ -0,0 +1,38 @@
+-- --------------------------------------------------------------- GGG GOLF SUPABASE MIGRATIONS ---------------------------------------------------------------
+-- Schema changes the app relies on beyond the original tables. Run in the Supabase SQL editor, top to bottom.
+-- Every statement is idempotent, so re-running the file is safe.
+
+-- --- 1. LIVE SCORES PARTITIONED BY ROUND ---
+-- Live scoring writes to the current week's round (not a fixed week 1). The upsert key doubles as the
+-- index for full-board reads by week; polls filter on week + updated_at.
+alter table live_scores add column if not exists updated_at timestamptz not null default now();
+create unique index if not exists live_scores_week_player_hole_key on live_scores (week, player_name, hole_number);
+create index if not exists live_scores_week_updated_at_idx on live_scores (week, updated_at);
+
+-- --- 2. MATERIALIZED HANDICAPS ---
+-- Handicap per player per target week (121 / 122 = 12-A / 12-B). Only the target weeks a submitted round
+-- can move are rewritten on each score save; Admin > Rebuild Handicap Table refills it from scratch.
+create table if not exists league_handicaps_2026 (
+    "Player" text not null,
+    "Week" integer not null,
+    "Handicap" real not null default 0,
+    updated_at timestamptz not null default now(),
+    primary key ("Player", "Week")
+);
+
+-- --- 3. SCORES CHANGE TRACKING ---
+-- load_data() syncs incrementally on updated_at (rows with updated_at >= the last one it saw). Inserts get the
+-- default; the trigger stamps every update, so rows changed outside the app are picked up as well.
+alter table league_scores_2026 add column if not exists updated_at timestamptz not null default now();
+create index if not exists league_scores_2026_updated_at_idx on league_scores_2026 (updated_at);
+
+create or replace function ggg_touch_updated_at() returns trigger as $$
+begin
+    new.updated_at = now();
+    return new;
+end;
+$$ language plpgsql;
+
+drop trigger if exists league_scores_2026_touch_updated_at on league_scores_2026;
+create trigger league_scores_2026_touch_updated_at before update on league_scores_2026
+    for each row execute function ggg_touch_updated_at();
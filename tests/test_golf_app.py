@@ -0,0 +1,91 @@
+# The app script end to end on a local SQLite league (GGG_SQLITE_PATH), via Streamlit's in-process AppTest
+import os
+import sqlite3
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import league_data
+from league_data import SCORES_TABLE, CircuitOpenError, SQLiteBackend
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "golf_app.py")
+
+
+@pytest.fixture
+def league(tmp_path, monkeypatch):
+    # A scores table from before "League Fee Paid" existed; every other table is created by the backend
+    path = str(tmp_path / "league.db")
+    with sqlite3.connect(path) as db:
+        db.execute(
+            f'CREATE TABLE "{SCORES_TABLE}" ("Week" INTEGER, "Player" TEXT, "PIN" TEXT, "Pars_Count" INTEGER, '
+            '"Birdies_Count" INTEGER, "Eagle_Count" INTEGER, "Total_Score" INTEGER, "Handicap" REAL, "Net_Score" REAL, '
+            '"DNF" INTEGER, "Acknowledged" INTEGER, "updated_at" TEXT, UNIQUE ("Week", "Player"))'
+        )
+    backend = SQLiteBackend(path)
+    for week, player, score in [(0, "Ann", 0), (0, "Bob", 0), (1, "Ann", 41), (1, "Bob", 44)]:
+        backend.upsert(SCORES_TABLE, {"Week": week, "Player": player, "PIN": "1234", "Total_Score": score,
+                                      "Net_Score": score, "DNF": False})
+    monkeypatch.setenv("GGG_SQLITE_PATH", path)
+    # The repository and the shared scores snapshot are process-wide resources
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    yield backend
+    st.cache_resource.clear()
+    st.cache_data.clear()
+
+
+def record_score_reads(monkeypatch, fail=None):
+    reads = []
+    scores = league_data.LeagueRepository.scores
+
+    def recording(self, changed_since=None, columns="*"):
+        reads.append(columns)
+        if fail is not None:
+            raise fail
+        return scores(self, changed_since=changed_since, columns=columns)
+
+    monkeypatch.setattr(league_data.LeagueRepository, "scores", recording)
+    return reads
+
+
+def test_select_scores_steps_down_on_a_missing_column(league, monkeypatch):
+    reads = record_score_reads(monkeypatch)
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    assert not at.exception
+    assert not [w.value for w in at.warning if "Database error" in w.value]
+    # Projected with the optional column, then the core columns; never select *
+    assert len(reads) == 2
+    assert '"League Fee Paid"' in reads[0]
+    assert '"League Fee Paid"' not in reads[1] and reads[1] != "*"
+    # The rows still load: the Standings table lists both players
+    at.session_state["main_tabs"] = "🏆 Standings"
+    at.run()
+    assert any({"Ann", "Bob"} <= set(df.value.get("Player", [])) for df in at.dataframe)
+
+
+def test_select_scores_raises_other_errors_without_stepping_down(league, monkeypatch):
+    reads = record_score_reads(monkeypatch, fail=CircuitOpenError(0))
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    assert not at.exception
+    assert reads and all('"League Fee Paid"' in columns for columns in reads)
+
+
+def failing_handicaps(monkeypatch, error):
+    def handicaps(self):
+        raise error
+    monkeypatch.setattr(league_data.LeagueRepository, "handicaps", handicaps)
+
+
+def test_handicap_seed_logs_a_failed_read(league, monkeypatch, caplog):
+    failing_handicaps(monkeypatch, ValueError("permission denied for table"))
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    assert not at.exception
+    assert any("permission denied for table" in r.getMessage() for r in caplog.records if r.levelname == "WARNING")
+
+
+def test_handicap_seed_without_the_table_is_quiet(league, monkeypatch, caplog):
+    failing_handicaps(monkeypatch, type("APIError", (Exception,), {"code": "42P01"})("relation does not exist"))
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    assert not at.exception
+    assert not [r for r in caplog.records if "handicaps" in r.getMessage()]
@@ -0,0 +1,271 @@
+# Repository behaviour on the local SQLite backend: column checks, retries and the shared circuit breaker
+import sqlite3
+
+import pytest
+
+import league_data
+from league_data import (
+    BREAKER_COOLDOWN, BREAKER_THRESHOLD, RETRY_ATTEMPTS, SCORES_TABLE, CircuitBreaker, CircuitOpenError,
+    LeagueRepository, SQLiteBackend, is_missing_table, is_transient, is_undefined_column,
+)
+
+
+def score_row(week=1, player="Ann", **extra):
+    return {"Week": week, "Player": player, "PIN": "1234", "Total_Score": 40, "DNF": False, **extra}
+
+
+# --- SQLITE BACKEND ---
+
+def test_select_projects_known_columns():
+    backend = SQLiteBackend()
+    backend.upsert(SCORES_TABLE, score_row())
+    assert backend.select(SCORES_TABLE, 'Week,Player,"Total_Score"') == [{"Week": 1, "Player": "Ann", "Total_Score": 40}]
+
+
+def test_select_unknown_column_raises():
+    # SQLite alone would hand back the quoted name as a constant string column
+    backend = SQLiteBackend()
+    backend.upsert(SCORES_TABLE, score_row())
+    with pytest.raises(sqlite3.OperationalError, match="no such column: Nope"):
+        backend.select(SCORES_TABLE, 'Week,"Nope"')
+
+
+def test_filter_on_unknown_column_raises():
+    backend = SQLiteBackend()
+    with pytest.raises(sqlite3.OperationalError, match="no such column: Wek"):
+        backend.select(SCORES_TABLE, eq={"Wek": 1})
+    with pytest.raises(sqlite3.OperationalError, match="no such column: Wek"):
+        backend.delete(SCORES_TABLE, eq={"Wek": 1})
+
+
+def test_column_missing_from_an_older_file_raises(tmp_path):
+    # A file created before a column joined the spec keeps its old schema, like a table the migration never ran on
+    path = str(tmp_path / "league.db")
+    with sqlite3.connect(path) as db:
+        db.execute(f'CREATE TABLE "{SCORES_TABLE}" ("Week" INTEGER, "Player" TEXT, "PIN" TEXT, UNIQUE ("Week", "Player"))')
+    backend = SQLiteBackend(path)
+    with pytest.raises(sqlite3.OperationalError, match="no such column: League Fee Paid"):
+        backend.select(SCORES_TABLE, 'Week,Player,"League Fee Paid"')
+    assert backend.select(SCORES_TABLE, "Week,Player") == []
+
+
+def test_is_undefined_column():
+    backend = SQLiteBackend()
+    with pytest.raises(sqlite3.OperationalError) as missing:
+        backend.select(SCORES_TABLE, '"Nope"')
+    assert is_undefined_column(missing.value)
+    # postgrest APIError carries the Postgres / PostgREST code
+    for code in ("42703", "PGRST204"):
+        assert is_undefined_column(type("APIError", (Exception,), {"code": code})())
+    assert not is_undefined_column(type("APIError", (Exception,), {"code": "23505"})())
+    assert not is_undefined_column(sqlite3.OperationalError("database is locked"))
+    assert not is_undefined_column(TimeoutError())
+    assert not is_undefined_column(CircuitOpenError(0))
+
+
+
+def test_is_missing_table():
+    for code in ("42P01", "PGRST205"):
+        assert is_missing_table(type("APIError", (Exception,), {"code": code})())
+    assert is_missing_table(sqlite3.OperationalError("no such table: league_handicaps_2026"))
+    assert not is_missing_table(sqlite3.OperationalError("no such column: Nope"))
+    assert not is_missing_table(TimeoutError())
+
+# --- PAIRINGS ---
+
+class FailingInserts(SQLiteBackend):
+    # Inserts succeed until `after` of them have gone through, then fail like a constraint violation would
+    def __init__(self, after):
+        super().__init__()
+        self.after = after
+
+    def insert(self, table, rows):
+        if self.after <= 0:
+            raise ValueError("insert rejected")
+        self.after -= 1
+        return super().insert(table, rows)
+
+
+def group_rows(week, groups):
+    return [{"week": week, "group_id": g, "players": ", ".join(players)} for g, players in enumerate(groups, start=1)]
+
+
+def published(repo, week):
+    return sorted((r["group_id"], r["players"]) for r in repo.pairings() if r["week"] == week)
+
+
+def test_replace_pairings_swaps_the_week():
+    repo = LeagueRepository(SQLiteBackend())
+    repo.add_pairings(group_rows(3, [["Ann", "Bob"], ["Cy", "Di"]]) + group_rows(5, [["Ann", "Cy"]]))
+    repo.replace_pairings([3], [group_rows(3, [["Ann", "Di"], ["Bob", "Cy"]])])
+    assert published(repo, 3) == [(1, "Ann, Di"), (2, "Bob, Cy")]
+    assert published(repo, 5) == [(1, "Ann, Cy")]
+
+
+def test_failed_publish_keeps_the_published_week():
+    backend = FailingInserts(after=1)
+    repo = LeagueRepository(backend)
+    repo.add_pairings(group_rows(3, [["Ann", "Bob"], ["Cy", "Di"]]))
+    with pytest.raises(ValueError):
+        repo.replace_pairings([3], [group_rows(3, [["Ann", "Di"], ["Bob", "Cy"]])])
+    assert published(repo, 3) == [(1, "Ann, Bob"), (2, "Cy, Di")]
+
+
+def test_failed_import_batch_takes_back_the_written_batches():
+    # Second of three batches fails: week 3 keeps its old groups and nothing of the import is left behind
+    backend = FailingInserts(after=2)
+    repo = LeagueRepository(backend)
+    repo.add_pairings(group_rows(3, [["Ann", "Bob"]]))
+    batches = [group_rows(3, [["Cy", "Di"]]), group_rows(4, [["Ann", "Cy"]]), group_rows(5, [["Bob", "Di"]])]
+    with pytest.raises(ValueError):
+        repo.replace_pairings([3], batches)
+    assert [(r["week"], r["players"]) for r in repo.pairings()] == [(3, "Ann, Bob")]
+
+
+# --- RETRIES AND THE CIRCUIT BREAKER ---
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(league_data.time, "time", clock)
+    monkeypatch.setattr(league_data.time, "sleep", lambda seconds: None)
+    return clock
+
+
+class ScriptedBackend(SQLiteBackend):
+    # select raises whatever `errors` holds next (None = succeed) and counts every call that reached it
+    def __init__(self, errors=()):
+        super().__init__()
+        self.errors = list(errors)
+        self.calls = 0
+        self.during = None
+
+    def select(self, table, *args, **kwargs):
+        self.calls += 1
+        if self.during is not None:
+            self.during()
+        error = self.errors.pop(0) if self.errors else None
+        if error is not None:
+            raise error
+        return super().select(table, *args, **kwargs)
+
+
+def trip(repo, backend):
+    # BREAKER_THRESHOLD calls in a row, each one failing every retry
+    backend.errors = [ConnectionError("down")] * (BREAKER_THRESHOLD * RETRY_ATTEMPTS)
+    for _ in range(BREAKER_THRESHOLD):
+        with pytest.raises(ConnectionError):
+            repo.scores()
+
+
+def test_breaker_opens_after_threshold(clock):
+    backend = ScriptedBackend()
+    repo = LeagueRepository(backend, CircuitBreaker())
+    backend.errors = [ConnectionError("down")] * ((BREAKER_THRESHOLD - 1) * RETRY_ATTEMPTS)
+    for _ in range(BREAKER_THRESHOLD - 1):
+        with pytest.raises(ConnectionError):
+            repo.scores()
+    assert not repo.breaker.is_open()
+    backend.errors = [ConnectionError("down")] * RETRY_ATTEMPTS
+    with pytest.raises(ConnectionError):
+        repo.scores()
+    assert repo.breaker.is_open()
+    assert backend.calls == BREAKER_THRESHOLD * RETRY_ATTEMPTS
+    # Open: fails fast without reaching the database, until the cooldown is over
+    clock.now += BREAKER_COOLDOWN - 1
+    with pytest.raises(CircuitOpenError):
+        repo.scores()
+    assert backend.calls == BREAKER_THRESHOLD * RETRY_ATTEMPTS
+
+
+def test_success_resets_the_failure_count(clock):
+    backend = ScriptedBackend()
+    repo = LeagueRepository(backend, CircuitBreaker())
+    for _ in range(2 * BREAKER_THRESHOLD):
+        backend.errors = [ConnectionError("down")] * RETRY_ATTEMPTS + [None]
+        with pytest.raises(ConnectionError):
+            repo.scores()
+        repo.scores()
+    assert not repo.breaker.is_open()
+
+
+def test_exactly_one_probe_after_cooldown(clock):
+    backend = ScriptedBackend()
+    repo = LeagueRepository(backend, CircuitBreaker())
+    trip(repo, backend)
+    clock.now += BREAKER_COOLDOWN
+    calls = backend.calls
+    # Everyone else who arrives while the probe is in flight keeps failing fast
+    others = []
+
+    def concurrent_caller():
+        backend.during = None
+        for _ in range(5):
+            with pytest.raises(CircuitOpenError):
+                repo.scores()
+            others.append(True)
+
+    backend.during = concurrent_caller
+    assert repo.scores() == []
+    assert others == [True] * 5
+    assert backend.calls == calls + 1
+
+
+def test_failed_probe_reopens_without_retrying(clock):
+    backend = ScriptedBackend()
+    repo = LeagueRepository(backend, CircuitBreaker())
+    trip(repo, backend)
+    clock.now += BREAKER_COOLDOWN
+    calls = backend.calls
+    backend.errors = [ConnectionError("still down")] * RETRY_ATTEMPTS
+    with pytest.raises(ConnectionError):
+        repo.scores()
+    # One attempt, and a full cooldown from the probe's failure
+    assert backend.calls == calls + 1
+    assert repo.breaker.cooling_until == clock.now + BREAKER_COOLDOWN
+    clock.now += BREAKER_COOLDOWN - 1
+    with pytest.raises(CircuitOpenError):
+        repo.scores()
+    assert backend.calls == calls + 1
+
+
+def test_successful_probe_closes_the_breaker(clock):
+    backend = ScriptedBackend()
+    repo = LeagueRepository(backend, CircuitBreaker())
+    trip(repo, backend)
+    clock.now += BREAKER_COOLDOWN
+    calls = backend.calls
+    repo.scores()
+    # Closed again: later calls go straight through, retries included
+    repo.scores()
+    backend.errors = [ConnectionError("blip"), None]
+    repo.scores()
+    assert backend.calls == calls + 4
+    assert not repo.breaker.is_open()
+
+
+@pytest.mark.parametrize("message, transient", [
+    ("database is locked", True),
+    ("database table is locked", True),
+    ("no such column: Nope", False),
+    ('near "FROM": syntax error', False),
+    ("unable to open database file", False),
+])
+def test_sqlite_retries_only_a_locked_database(clock, message, transient):
+    error = sqlite3.OperationalError(message)
+    assert is_transient(error) == transient
+    backend = ScriptedBackend([error] * RETRY_ATTEMPTS)
+    repo = LeagueRepository(backend, CircuitBreaker())
+    with pytest.raises(sqlite3.OperationalError):
+        repo.scores()
+    assert backend.calls == (RETRY_ATTEMPTS if transient else 1)
+    # A database that answers with a bad request is reachable: it never counts toward opening the breaker
+    assert repo.breaker.failures == (1 if transient else 0)
@@ -0,0 +1,161 @@
+# Admin CSV import validators: weeks, DNF forms, score range, in-file duplicates and published pairings
+import io
+
+import pandas as pd
+import pytest
+
+from league_import import (
+    IMPORT_BATCH_SIZE, import_batches, parse_import_week, read_import_csv, validate_pairings, validate_registrations,
+    validate_rounds,
+)
+
+REGISTERED = ["Ann", "Bob", "Cy", "Di"]
+# Handicap the scorecard would apply per (player, target week)
+MATRIX = pd.DataFrame({3: {"Ann": 4.0, "Bob": 6.5}, 121: {"Ann": 5.0, "Bob": 7.0}, 122: {"Ann": 5.5, "Bob": 7.5}})
+
+
+def csv(text):
+    return read_import_csv(io.StringIO(text))
+
+
+def errors_by_row(errors):
+    return {e["Row"]: e["Error"] for e in errors}
+
+
+# --- ROUNDS ---
+
+@pytest.mark.parametrize("text, week", [("12-A", 121), ("12a", 121), ("Week 12-B", 122), ("wk 12B", 122), ("3", 3), ("3.0", 3), ("x", None)])
+def test_parse_import_week(text, week):
+    assert parse_import_week(text) == week
+
+
+def test_rounds_map_12a_12b_and_reject_week_0_and_12():
+    rows, errors = validate_rounds(csv(
+        "Week,Player,Total_Score\n"
+        "12-A,Ann,41\n"
+        "12-B,Ann,43\n"
+        "0,Bob,40\n"
+        "12,Bob,40\n"
+        "15,Bob,40\n"
+    ), REGISTERED, MATRIX)
+    assert [(r["Week"], r["Handicap"], r["Net_Score"]) for r in rows] == [(121, 5.0, 36.0), (122, 5.5, 37.5)]
+    errors = errors_by_row(errors)
+    assert errors[4] == "Week 0 is the registration row, use the Registrations import"
+    assert errors[5] == "Week 12 is scored as 12-A and 12-B"
+    assert errors[6] == "Week 15 is not on the season calendar"
+
+
+@pytest.mark.parametrize("score, dnf", [("DNF", ""), ("dnf", ""), ("0", "true"), ("", "yes"), ("45", "x"), ("45", "Y")])
+def test_rounds_dnf_forms(score, dnf):
+    rows, errors = validate_rounds(csv(f"Week,Player,Total_Score,DNF\n3,Ann,{score},{dnf}\n"), REGISTERED, MATRIX)
+    assert errors == []
+    assert rows[0]["DNF"] is True and rows[0]["Total_Score"] == 0 and rows[0]["Net_Score"] == 0.0
+
+
+def test_rounds_reject_unknown_dnf_text():
+    rows, errors = validate_rounds(csv("Week,Player,Total_Score,DNF\n3,Ann,45,maybe\n"), REGISTERED, MATRIX)
+    assert rows == [] and errors[0]["Error"] == "DNF 'maybe' must be true or false"
+
+
+@pytest.mark.parametrize("score, ok", [("24", False), ("25", True), ("119", True), ("120", False), ("44.5", False), ("abc", False)])
+def test_rounds_score_range(score, ok):
+    rows, errors = validate_rounds(csv(f"Week,Player,Total_Score\n3,Ann,{score}\n"), REGISTERED, MATRIX)
+    assert bool(rows) == ok
+    if ok:
+        assert rows[0]["Total_Score"] == int(score) and rows[0]["Net_Score"] == int(score) - 4.0
+    else:
+        assert errors[0]["Error"] == f"Total_Score {score!r} must be DNF or 25-119"
+
+
+def test_rounds_reject_duplicates_and_unregistered_players():
+    rows, errors = validate_rounds(csv(
+        "Week,Player,Total_Score,Handicap\n"
+        "3,Ann,41,2.5\n"
+        "3,Ann,44,\n"
+        "12-A,Ann,41,\n"
+        "3,Zed,40,\n"
+    ), REGISTERED, MATRIX)
+    assert [(r["Week"], r["Handicap"]) for r in rows] == [(3, 2.5), (121, 5.0)]
+    assert errors_by_row(errors) == {3: "Duplicate of an earlier row in this file", 5: "Zed is not registered"}
+
+
+def test_rounds_reject_missing_and_unknown_columns():
+    rows, errors = validate_rounds(csv("Week,Player,Score\n3,Ann,41\n"), REGISTERED, MATRIX)
+    assert rows == []
+    assert [e["Error"] for e in errors] == [
+        "Missing column(s): Total_Score",
+        "Unknown column(s): Score. Expected: Week, Player, Total_Score, Pars_Count, Birdies_Count, Eagle_Count, Handicap, DNF",
+    ]
+
+
+# --- REGISTRATIONS ---
+
+def test_registrations():
+    rows, errors = validate_registrations(csv(
+        "Player,PIN\n"
+        "Eve,0042\n"
+        "Eve,1111\n"
+        "Ann,1234\n"
+        "Fay,12a4\n"
+        ",1234\n"
+    ), REGISTERED)
+    assert [(r["Week"], r["Player"], r["PIN"], r["DNF"]) for r in rows] == [(0, "Eve", "0042", True)]
+    assert errors_by_row(errors) == {
+        3: "Duplicate of an earlier row in this file",
+        4: "Ann is already registered",
+        5: "PIN must be 4 digits",
+        6: "Player name is blank",
+    }
+
+
+# --- PAIRINGS ---
+
+def test_pairings_within_the_file():
+    rows, errors = validate_pairings(csv(
+        "week,group_id,players\n"
+        '3,1,"Ann, Bob"\n'
+        '3,1,"Cy, Di"\n'
+        '3,2,"Bob, Cy"\n'
+        '4,1,"Ann, Bob"\n'
+        '5,1,"Ann, Zed"\n'
+    ), REGISTERED)
+    assert rows == [{"week": 3, "group_id": 1, "players": "Ann, Bob"}]
+    assert errors_by_row(errors) == {
+        3: "Group 1 appears twice for Week 3",
+        4: "Already in another group this week: Bob",
+        5: "Week 4 is a GGG Event, pairings are not required",
+        6: "Not registered: Zed",
+    }
+
+
+def test_pairings_collide_with_published_groups():
+    published = [{"week": 3, "group_id": 1, "players": "Ann, Bob"}]
+    frame = csv(
+        "week,group_id,players\n"
+        '3,1,"Cy, Di"\n'
+        '3,2,"Bob, Cy"\n'
+        '3,2,"Di"\n'
+        '5,1,"Ann, Bob"\n'
+    )
+    rows, errors = validate_pairings(frame, REGISTERED, published)
+    assert rows == [{"week": 3, "group_id": 2, "players": "Di"}, {"week": 5, "group_id": 1, "players": "Ann, Bob"}]
+    assert errors_by_row(errors) == {
+        2: "Group 1 is already published for Week 3",
+        3: "Already in a published group this week: Bob",
+    }
+    # Weeks being replaced are left out of published, so a whole new week goes through
+    replacement = csv('week,group_id,players\n3,1,"Cy, Di"\n3,2,"Ann, Bob"\n')
+    assert len(validate_pairings(replacement, REGISTERED, published)[1]) == 2
+    rows, errors = validate_pairings(replacement, REGISTERED, [])
+    assert errors == [] and len(rows) == 2
+
+
+# --- BATCHES ---
+
+@pytest.mark.parametrize("n, sizes", [(0, []), (1, [1]), (500, [500]), (501, [500, 1]), (1250, [500, 500, 250])])
+def test_import_batches(n, sizes):
+    assert IMPORT_BATCH_SIZE == 500
+    rows = list(range(n))
+    batches = list(import_batches(rows))
+    assert [len(b) for b in batches] == sizes
+    assert [r for b in batches for r in b] == rows
@@ -0,0 +1,71 @@
+# Weekly pairing optimizer: every player placed once, the planned group sizes, and no worse than its starting point
+import random
+
+import pandas as pd
+import pytest
+
+import league_engine
+from league_engine import optimize_pairings, pairing_group_sizes, pairing_history
+
+SEEDS = range(6)
+
+
+def roster(n):
+    return [f"P{i:02d}" for i in range(n)]
+
+
+def random_history(seed, players, weeks=8):
+    # Earlier weeks of shuffled foursomes, as weekly_pairings rows
+    rng = random.Random(seed)
+    rows = []
+    for week in range(1, weeks + 1):
+        shuffled = rng.sample(players, len(players))
+        for g, start in enumerate(range(0, len(shuffled), 4), start=1):
+            rows.append({"week": week, "group_id": g, "players": ", ".join(shuffled[start:start + 4])})
+    return pd.DataFrame(rows)
+
+
+def repeat_cost(groups, history, players):
+    index = {p: i for i, p in enumerate(players)}
+    return sum(history[index[a], index[b]] for grp in groups for i, a in enumerate(grp) for b in grp[i + 1:])
+
+
+@pytest.mark.parametrize("n, sizes", [(1, [1]), (4, [4]), (8, [4, 4]), (9, [3, 3, 3]), (10, [4, 3, 3]), (13, [4, 3, 3, 3])])
+def test_group_sizes(n, sizes):
+    assert pairing_group_sizes(n) == sizes
+
+
+def test_group_sizes_are_even_foursomes():
+    for n in range(1, 61):
+        sizes = pairing_group_sizes(n)
+        assert sum(sizes) == n
+        assert max(sizes) <= 4 and max(sizes) - min(sizes) <= 1
+        assert len(sizes) == -(-n // 4)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("n", [1, 3, 5, 10, 17, 24, 37])
+def test_every_player_placed_once_in_planned_groups(seed, n):
+    players = roster(n)
+    history = pairing_history(random_history(seed, players), players)
+    handicaps = {p: random.Random(seed + i).uniform(0, 16) for i, p in enumerate(players)}
+    for hcps in (None, handicaps):
+        groups, repeats = optimize_pairings(players, history, hcps, seed=seed)
+        placed = [p for grp in groups for p in grp]
+        assert sorted(placed) == players
+        assert [len(grp) for grp in groups] == pairing_group_sizes(n)
+        assert repeats == repeat_cost(groups, history, players)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("balance", [False, True])
+def test_never_worse_than_the_starting_point(seed, balance, monkeypatch):
+    players = roster(30)
+    history = pairing_history(random_history(seed, players), players)
+    handicaps = {p: random.Random(seed * 100 + i).uniform(0, 16) for i, p in enumerate(players)} if balance else None
+    groups, repeats = optimize_pairings(players, history, handicaps, seed=seed)
+    # No swaps: the snake draft / shuffle the search starts from, with the same seed
+    monkeypatch.setattr(league_engine, "PAIRING_SWAPS_PER_PLAYER", 0)
+    start_groups, start_repeats = optimize_pairings(players, history, handicaps, seed=seed)
+    assert start_repeats == repeat_cost(start_groups, history, players)
+    assert repeats <= start_repeats